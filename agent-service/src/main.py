@@ -4,11 +4,14 @@ Provides endpoints for event parsing and queries
 Never writes directly to master.log - only through Rust API
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
-import requests
 import json
 import re
 import threading
@@ -22,7 +25,38 @@ from dotenv import load_dotenv
 from parser import EventParser
 from query_engine import QueryEngine
 
-app = FastAPI(title="Event Agent API", version="0.1.0")
+# Shared client for the Rust API; created on first use inside the event loop
+_rust_http: Optional[aiohttp.ClientSession] = None
+
+
+def _rust_session() -> aiohttp.ClientSession:
+    global _rust_http
+    if _rust_http is None or _rust_http.closed:
+        connector = aiohttp.TCPConnector(
+            limit=RUST_API_POOL_LIMIT,
+            limit_per_host=RUST_API_POOL_LIMIT,
+            keepalive_timeout=RUST_API_KEEPALIVE_SECONDS,
+            ttl_dns_cache=RUST_API_DNS_CACHE_SECONDS,
+        )
+        _rust_http = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=RUST_API_TIMEOUT_SECONDS),
+        )
+    return _rust_http
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    if _rust_http is not None:
+        await _rust_http.close()
+
+
+app = FastAPI(
+    title="Event Agent API",
+    version="0.1.0",
+    lifespan=_lifespan,
+)
 
 # Initialize components
 parser = EventParser()
@@ -30,11 +64,24 @@ query_engine = QueryEngine()
 
 # Rust API endpoint (where master.log lives)
 RUST_API_URL = "http://localhost:8080"
+RUST_API_TIMEOUT_SECONDS = 5
+# Keep-alive pool to the single Rust API host; its name is resolved once
+RUST_API_POOL_LIMIT = 16
+RUST_API_KEEPALIVE_SECONDS = 75
+RUST_API_DNS_CACHE_SECONDS = 300
+# The bot keeps idle connections to this service pooled for 75s; uvicorn's own
+# default (5s) would close them first and the next reuse would fail mid-request.
+SERVER_KEEPALIVE_SECONDS = 90
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 load_dotenv(BASE_DIR / ".env")
 OBSIDIAN_SYNC_SCRIPT = BASE_DIR / "obsidian-sync" / "sync.py"
 RUST_API_URL = os.getenv("RUST_API_URL", RUST_API_URL)
 
+# Leading rejection words stripped from a correction before it is re-parsed
+_CORRECTION_PREFIX_RE = re.compile(
+    r"^(no|nope|actually|wrong|incorrect)[,\s]*", re.IGNORECASE
+)
+
 
 def _motivation_for_event(parsed_event: Dict[str, Any]) -> Optional[str]:
     action = (parsed_event.get("action") or "").lower()
@@ -96,47 +143,70 @@ class ConfirmationInput(BaseModel):
     original_input: str
 
 
+def _parse_one(
+    input_data: EventInput, background_tasks: BackgroundTasks
+) -> Dict[str, Any]:
+    """Parse one input into the /parse response body"""
+    # Parse the input
+    result = parser.parse(input_data.input, use_llm=input_data.use_llm)
+
+    if result.get("needs_clarification"):
+        return {
+            "status": "needs_clarification",
+            "suggestion": None,
+            "details": result,
+            "message": result.get("clarification_message")
+            or "Please clarify your goal. Example: add goal short term learn japanese",
+        }
+
+    # Store LLM decision for training; the reply doesn't depend on it, so
+    # the SQLite write runs after the response has been sent
+    decision = {
+        "timestamp": datetime.now().isoformat(),
+        "user_input": input_data.input,
+        "llm_suggestion": result["formatted_event"],
+        "user_response": "pending",  # Will be updated on confirmation
+        "confidence": result.get("confidence", 0.7),
+        "model": "qwen-2.5-3b" if input_data.use_llm else "rule_based",
+    }
+    background_tasks.add_task(query_engine.store_llm_decision, decision)
+
+    return {
+        "status": "parsed",
+        "suggestion": result["formatted_event"],
+        "details": result,
+        "message": f"I understood: {result['formatted_event']}. Is this correct?",
+    }
+
+
 @app.post("/parse")
-async def parse_event(input_data: EventInput):
+async def parse_event(input_data: EventInput, background_tasks: BackgroundTasks):
     """
     Parse natural language into structured event
     Returns suggestion - user must confirm before writing to log
     """
     try:
-        # Parse the input
-        result = parser.parse(input_data.input, use_llm=input_data.use_llm)
-
-        if result.get("needs_clarification"):
-            return {
-                "status": "needs_clarification",
-                "suggestion": None,
-                "details": result,
-                "message": result.get("clarification_message")
-                or "Please clarify your goal. Example: add goal short term learn japanese",
-            }
-
-        # Store LLM decision for training
-        decision = {
-            "timestamp": datetime.now().isoformat(),
-            "user_input": input_data.input,
-            "llm_suggestion": result["formatted_event"],
-            "user_response": "pending",  # Will be updated on confirmation
-            "confidence": result.get("confidence", 0.7),
-            "model": "qwen-2.5-3b" if input_data.use_llm else "rule_based",
-        }
-        query_engine.store_llm_decision(decision)
-
-        return {
-            "status": "parsed",
-            "suggestion": result["formatted_event"],
-            "details": result,
-            "message": f"I understood: {result['formatted_event']}. Is this correct?",
-        }
-
+        return _parse_one(input_data, background_tasks)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/parse_batch")
+async def parse_events(inputs: List[EventInput], background_tasks: BackgroundTasks):
+    """
+    Parse several inputs in one request (coalesced by the bot under load)
+    Results are positional; a failed item gets status "error" with its detail
+    instead of failing the whole batch
+    """
+    results = []
+    for input_data in inputs:
+        try:
+            results.append(_parse_one(input_data, background_tasks))
+        except Exception as e:
+            results.append({"status": "error", "detail": str(e)})
+    return results
+
+
 @app.post("/confirm")
 async def confirm_event(confirmation: ConfirmationInput):
     """
@@ -158,12 +228,15 @@ async def confirm_event(confirmation: ConfirmationInput):
             # User confirmed - forward to Rust API
             event_to_log = confirmation.parsed_event["formatted_event"]
 
-            # Call Rust API to append to master.log
-            rust_response = requests.post(
-                f"{RUST_API_URL}/events", json={"event": event_to_log}, timeout=5
-            )
+            # Call Rust API to append to master.log; awaited so other
+            # requests keep being served while it responds
+            async with _rust_session().post(
+                f"{RUST_API_URL}/events", json={"event": event_to_log}
+            ) as rust_response:
+                rust_status = rust_response.status
+                rust_body = await rust_response.text()
 
-            if rust_response.status_code == 200:
+            if rust_status == 200:
                 # Update LLM decision as accepted
                 # Store context in SQLite
                 context_data = {
@@ -171,11 +244,11 @@ async def confirm_event(confirmation: ConfirmationInput):
                     "user_confirmed": True,
                     "timestamp": datetime.now().isoformat(),
                 }
-                query_engine.store_context(context_data)
+                await asyncio.to_thread(query_engine.store_context, context_data)
                 _trigger_obsidian_sync()
 
                 # Get session info from Rust API
-                session_info = rust_response.json()
+                session_info = json.loads(rust_body)
 
                 return {
                     "status": "logged",
@@ -187,7 +260,7 @@ async def confirm_event(confirmation: ConfirmationInput):
             else:
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Failed to write to master.log: {rust_response.text}",
+                    detail=f"Failed to write to master.log: {rust_body}",
                 )
 
         else:
@@ -201,15 +274,12 @@ async def confirm_event(confirmation: ConfirmationInput):
                 "confidence": 0.0,  # Mark as incorrect
                 "model": "user_correction",
             }
-            query_engine.store_llm_decision(correction)
+            await asyncio.to_thread(query_engine.store_llm_decision, correction)
 
             # Try to parse the correction
             # Remove common prefixes like "No, it was", "Actually", etc.
-            cleaned_input = re.sub(
-                r"^(no|nope|actually|wrong|incorrect)[,\s]*",
-                "",
-                confirmation.user_response,
-                flags=re.IGNORECASE,
+            cleaned_input = _CORRECTION_PREFIX_RE.sub(
+                "", confirmation.user_response
             ).strip()
 
             # Re-parse
@@ -233,8 +303,12 @@ async def process_query(query_input: QueryInput):
     Returns analytics and insights derived from event log
     """
     try:
-        result = query_engine.answer_query(
-            query_input.query, query_input.timeframe or "week"
+        # Replays the log and reads SQLite; run it off the event loop so one
+        # slow query doesn't stall every other request
+        result = await asyncio.to_thread(
+            query_engine.answer_query,
+            query_input.query,
+            query_input.timeframe or "week",
         )
 
         # For natural language response, we could use LLM
@@ -310,4 +384,6 @@ def format_query_response(result: Dict[str, Any]) -> str:
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000, timeout_keep_alive=SERVER_KEEPALIVE_SECONDS
+    )
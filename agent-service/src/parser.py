@@ -4,6 +4,7 @@ Follows the event-driven architecture: LLM is advisory only
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
@@ -47,8 +48,16 @@ class EventParser:
         "GOAL",
     ]
 
+    # Distinct inputs whose rule-based parse is memoized per parser
+    RULES_CACHE_SIZE = 512
+
     def __init__(self):
         self.llm = None  # Will be initialized with llama-cpp
+        # Rule parsing is a pure function of the text, and people repeat the
+        # same few phrasings; parse() hands out a copy of each cached result.
+        self._parse_rules_cached = lru_cache(maxsize=self.RULES_CACHE_SIZE)(
+            self._parse_and_format_rules
+        )
 
     def _extract_activity(self, input_text: str, category: Optional[str]) -> str:
         """
@@ -326,15 +335,21 @@ Response:"""
         """
         if use_llm and self.llm is not None:
             result = self.parse_with_llm(input_text)
+            # Add formatted event string
+            result["formatted_event"] = self.format_event(result)
         else:
-            result = self.parse_with_rules(input_text)
+            # Values are immutable, so a shallow copy isolates the cache
+            result = dict(self._parse_rules_cached(input_text))
 
-        # Add formatted event string
-        result["formatted_event"] = self.format_event(result)
         result["timestamp"] = datetime.now().isoformat()
 
         return result
 
+    def _parse_and_format_rules(self, input_text: str) -> Dict[str, Any]:
+        result = self.parse_with_rules(input_text)
+        result["formatted_event"] = self.format_event(result)
+        return result
+
 
 if __name__ == "__main__":
     parser = EventParser()
@@ -5,6 +5,7 @@ Respects invariants: only reads, never writes
 
 import os
 import sqlite3
+from collections import Counter
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -26,6 +27,9 @@ class QueryEngine:
     def init_database(self):
         """Initialize SQLite database for context storage"""
         with sqlite3.connect(self.db_path) as conn:
+            # WAL is persistent in the file, so the owner of context.db sets
+            # it once here; readers such as the Obsidian sync don't touch it.
+            conn.execute("PRAGMA journal_mode = WAL")
             cursor = conn.cursor()
 
             # Events table - rich metadata (not the source of truth)
@@ -44,6 +48,46 @@ class QueryEngine:
                 )
             """)
 
+            # Canonical casing (event_type lower, category upper) is enforced
+            # at write time so readers can compare columns directly and use
+            # the partial indexes below.
+            cursor.execute("""
+                UPDATE events
+                SET event_type = lower(event_type), category = upper(category)
+                WHERE event_type IS NOT lower(event_type)
+                   OR category IS NOT upper(category)
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS norm_event
+                AFTER INSERT ON events
+                WHEN NEW.event_type IS NOT lower(NEW.event_type)
+                  OR NEW.category IS NOT upper(NEW.category)
+                BEGIN
+                    UPDATE events
+                    SET event_type = lower(NEW.event_type),
+                        category = upper(NEW.category)
+                    WHERE id = NEW.id;
+                END
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_done
+                ON events(timestamp) WHERE event_type = 'done'
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_goal
+                ON events(timestamp) WHERE category = 'GOAL'
+            """)
+            # Per-day projections filter on date(timestamp); an expression
+            # index turns those scans into B-tree seeks.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_date
+                ON events(date(timestamp))
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_date_type
+                ON events(date(timestamp), event_type)
+            """)
+
             # LLM decisions for training
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS llm_decisions (
@@ -94,9 +138,9 @@ class QueryEngine:
         try:
             start_rows = self._fetchall(
                 """
-                SELECT timestamp, upper(category), activity
+                SELECT timestamp, category, activity
                 FROM events
-                WHERE lower(event_type) = 'start'
+                WHERE event_type = 'start'
                 ORDER BY datetime(timestamp), id
                 """
             )
@@ -209,12 +253,8 @@ class QueryEngine:
         """
         sessions = self.derive_sessions()
 
-        counts = {"THEORY": 0, "PRACTICE": 0, "TASK": 0, "GAME": 0}
-
-        for session in sessions:
-            cat = session.get("category", "UNKNOWN")
-            if cat in counts:
-                counts[cat] += 1
+        tally = Counter(session.get("category", "UNKNOWN") for session in sessions)
+        counts = {cat: tally[cat] for cat in ("THEORY", "PRACTICE", "TASK", "GAME")}
 
         total = sum(counts.values())
         if total == 0:
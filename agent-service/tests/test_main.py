@@ -0,0 +1,76 @@
+"""
+Tests for the HTTP service
+Checks how the served app behaves for a long-lived client such as the bot
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import unittest
+
+import aiohttp
+import uvicorn
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+sys.path.insert(0, SRC_DIR)
+
+import main  # noqa: E402
+
+# Longer than uvicorn's default keep-alive (5s) that the service used to run with
+IDLE_SECONDS = 6
+
+
+class TestKeepAlive(unittest.TestCase):
+    """A pooled connection must survive the bot's idle gaps"""
+
+    def test_idle_pooled_connection_is_reused(self):
+        async def scenario():
+            sock = socket.socket()
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+            server = uvicorn.Server(
+                uvicorn.Config(
+                    main.app,
+                    log_level="warning",
+                    timeout_keep_alive=main.SERVER_KEEPALIVE_SECONDS,
+                )
+            )
+            serving = asyncio.create_task(server.serve(sockets=[sock]))
+            while not server.started:
+                await asyncio.sleep(0.01)
+
+            reused = []
+
+            async def on_reuse(_session, _ctx, _params):
+                reused.append(True)
+
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_reuseconn.append(on_reuse)
+            # Same pool settings the bot uses for the agent service
+            connector = aiohttp.TCPConnector(limit=1, keepalive_timeout=75)
+            try:
+                async with aiohttp.ClientSession(
+                    f"http://127.0.0.1:{port}",
+                    connector=connector,
+                    trace_configs=[trace],
+                ) as http:
+                    async with http.get("/health") as response:
+                        self.assertEqual(response.status, 200)
+                    await asyncio.sleep(IDLE_SECONDS)
+                    async with http.get("/health") as response:
+                        self.assertEqual(response.status, 200)
+                        self.assertEqual((await response.json())["status"], "healthy")
+            finally:
+                server.should_exit = True
+                await serving
+
+            self.assertEqual(reused, [True])
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
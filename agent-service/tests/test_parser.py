@@ -109,6 +109,15 @@ class TestEventParser(unittest.TestCase):
         self.assertEqual(result1["formatted_event"], result2["formatted_event"])
         self.assertEqual(result2["formatted_event"], result3["formatted_event"])
 
+    def test_repeated_input_reuses_cached_parse(self):
+        """Repeated inputs hit the rule cache but get independent results"""
+        first = self.parser.parse("Started working on pandas theory")
+        first["activity"] = "MUTATED"
+        second = self.parser.parse("Started working on pandas theory")
+
+        self.assertEqual(second["activity"], "PANDAS")
+        self.assertEqual(self.parser._parse_rules_cached.cache_info().hits, 1)
+
     def test_no_direct_write(self):
         """CRITICAL: Parser never writes to master.log"""
         # Parser should only return suggestions, never modify files
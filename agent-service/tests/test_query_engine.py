@@ -153,6 +153,53 @@ class TestQueryEngine(unittest.TestCase):
             any(item["activity"] == "EMAILS" for item in answer["by_activity"])
         )
 
+    def test_store_context_canonicalizes_casing(self):
+        """event_type is stored lowercase and category uppercase"""
+        self.engine.store_context(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "action": "DONE",
+                "category": "goal",
+                "activity": "LEARN_RUST",
+            }
+        )
+
+        rows = self.engine._fetchall("SELECT event_type, category FROM events")
+
+        self.assertEqual(rows, [("done", "GOAL")])
+
+    def test_db_sessions_match_canonical_casing(self):
+        """Mixed-case input still derives a session from the stored row"""
+        self.engine.store_context(
+            {
+                "timestamp": "2026-02-17T09:00:00",
+                "action": "START",
+                "category": "theory",
+                "activity": "pandas",
+            }
+        )
+
+        sessions = self.engine._derive_sessions_from_db()
+
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["category"], "THEORY")
+
+    def test_per_date_lookup_uses_date_index(self):
+        """date(timestamp) filters are served by the expression index"""
+        plan = self.engine._fetchall(
+            "EXPLAIN QUERY PLAN SELECT timestamp FROM events "
+            "WHERE date(timestamp) = date(?)",
+            ("2026-02-17",),
+        )
+
+        self.assertTrue(any("idx_events_date" in row[-1] for row in plan))
+
+    def test_database_uses_wal_journal(self):
+        """The owning service switches context.db to WAL on init"""
+        rows = self.engine._fetchall("PRAGMA journal_mode")
+
+        self.assertEqual(rows, [("wal",)])
+
 
 class TestArchitectureInvariants(unittest.TestCase):
     """Validate architecture invariants in query engine"""
@@ -1,22 +1,48 @@
 import re
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import sys
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+_BRACKET_RE = re.compile(r"\[.*?\]")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_WS_RE = re.compile(r"\s+")
+_GOAL_VERB_RE = re.compile(r"\b(add|set|create|new|goal|goals)\b", re.IGNORECASE)
+_GOAL_TERM_RE = re.compile(
+    r"\b(short|medium|long)\s*-?\s*term\b|\bcome\s+back\s+to\b", re.IGNORECASE
+)
+
+_EMPTY_FROZENSET: FrozenSet[str] = frozenset()
+_EVENT_SOURCE_SUFFIX = " [source:: Event]"
+_TITLE: Dict[str, str] = {}
+
+
+def _titled(category: str) -> str:
+    titled = _TITLE.get(category)
+    if titled is None:
+        titled = category.title()
+        _TITLE[category] = titled
+    return titled
 
 
 class KanbanProjector:
     def build_bridge_projection(
         self,
-        rows: List[Tuple[str, str, str, str, str]],
+        rows: Iterable[Tuple[str, str, str, str, str]],
         backlog_items: List[str],
     ) -> Dict[str, List[str]]:
-        default = {"now": [], "paused": [], "captured": [], "next": []}
-        if not rows:
-            return default
-
-        manual_norm = {self.normalize_task_text(item) for item in backlog_items if item}
+        manual_norm: FrozenSet[str] = (
+            frozenset(self.normalize_task_text(item) for item in backlog_items if item)
+            if backlog_items
+            else _EMPTY_FROZENSET
+        )
         states: Dict[str, Dict[str, Any]] = {}
         active_key: Optional[str] = None
+        seen_rows = False
 
-        for timestamp, event_type, category, activity, raw_input in rows:
+        # Rows are (activity, event_type, category, timestamp, raw_input);
+        # activity comes first so empty rows are skipped before decoding the rest.
+        for row in rows:
+            seen_rows = True
+            activity = row[0]
             if not activity:
                 continue
 
@@ -24,6 +50,12 @@ class KanbanProjector:
             if not key:
                 continue
 
+            # Only a handful of distinct values exist; share one object each.
+            event_type = sys.intern(row[1] or "")
+            category = sys.intern(row[2] or "TASK")
+            timestamp = row[3]
+            raw_input = row[4]
+
             if event_type == "start":
                 if active_key and active_key in states:
                     if states[active_key].get("status") == "active":
@@ -33,7 +65,7 @@ class KanbanProjector:
                 states[key] = {
                     "status": "active",
                     "activity": self.display_activity(activity),
-                    "category": category or "TASK",
+                    "category": category,
                     "timestamp": timestamp,
                     "raw_input": raw_input or "",
                     "from_manual": key in manual_norm,
@@ -47,7 +79,7 @@ class KanbanProjector:
                     states[key] = {
                         "status": "done",
                         "activity": self.display_activity(activity),
-                        "category": category or "TASK",
+                        "category": category,
                         "timestamp": timestamp,
                         "raw_input": raw_input or "",
                         "from_manual": key in manual_norm,
@@ -55,6 +87,9 @@ class KanbanProjector:
                 if active_key == key:
                     active_key = None
 
+        if not seen_rows:
+            return {"now": [], "paused": [], "captured": [], "next": []}
+
         now_items: List[str] = []
         paused_items: List[str] = []
         captured_items: List[str] = []
@@ -64,9 +99,8 @@ class KanbanProjector:
                 continue
 
             line = (
-                f"{state['activity']} "
-                f"[category:: {str(state.get('category', 'TASK')).title()}] "
-                f"[source:: Event]"
+                f"{state['activity']} [category:: {_titled(state['category'])}]"
+                f"{_EVENT_SOURCE_SUFFIX}"
             )
 
             if state.get("status") == "active":
@@ -131,9 +165,9 @@ class KanbanProjector:
 
     def normalize_task_text(self, text: str) -> str:
         normalized = text.lower().strip()
-        normalized = re.sub(r"\[.*?\]", " ", normalized)
-        normalized = re.sub(r"[^a-z0-9\s]", " ", normalized)
-        normalized = re.sub(r"\s+", " ", normalized)
+        normalized = _BRACKET_RE.sub(" ", normalized)
+        normalized = _NON_ALNUM_RE.sub(" ", normalized)
+        normalized = _WS_RE.sub(" ", normalized)
         return normalized.strip()
 
     def display_activity(self, activity: str) -> str:
@@ -155,15 +189,9 @@ class KanbanProjector:
         self, activity: Optional[str], raw_input: Optional[str]
     ) -> str:
         if raw_input:
-            cleaned = re.sub(
-                r"\b(add|set|create|new)\b", "", raw_input, flags=re.IGNORECASE
-            )
-            cleaned = re.sub(r"\b(goal|goals)\b", "", cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(
-                r"\b(short|medium|long)\s*-?\s*term\b", "", cleaned, flags=re.IGNORECASE
-            )
-            cleaned = re.sub(r"\bcome\s+back\s+to\b", "", cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r"\s+", " ", cleaned).strip(" -")
+            cleaned = _GOAL_VERB_RE.sub("", raw_input)
+            cleaned = _GOAL_TERM_RE.sub("", cleaned)
+            cleaned = _WS_RE.sub(" ", cleaned).strip(" -")
             if cleaned:
                 return cleaned
 
@@ -1,79 +1,79 @@
 from typing import Dict, List, Optional
 
+_PREFIX_BYTES = b"---\nkanban-plugin: list\n---\n\n"
+_MID_BYTES = (
+    b"## Focus\n\n\n"
+    b"## Creative\n\n\n"
+    b"## Light\n\n\n"
+    b"## Recovery\n\n\n"
+    b"## Reflect\n\n\n"
+    b"## Backlog\n"
+)
+_RECONSIDER_BYTES = b"\n## Reconsider\n- [ ]\n\n## Done Today\n"
+_SUFFIX_BYTES = (
+    b"\n## Admin\n- [ ]\n\n\n"
+    b"%% kanban:settings\n"
+    b"```\n"
+    b'{"kanban-plugin":"list","list-collapse":[false,null,false,false,false,false]}\n'
+    b"```\n"
+    b"%%\n"
+)
+_BRIDGE_TEMPLATE = (
+    "## Now\n{now}\n\n"
+    "## Paused\n{paused}\n\n"
+    "## Captured from Reality\n{captured}\n\n"
+    "## Next 3\n{next}\n\n"
+)
+
 
 class BoardRenderer:
     @staticmethod
-    def render_task_board(
+    def _task_lines(items: List[str], checked: bool = False) -> List[str]:
+        if not items:
+            return ["- [ ]"] if not checked else ["- [x]"]
+        mark = "x" if checked else " "
+        return [f"- [{mark}] {item}" for item in items]
+
+    @classmethod
+    def _encode_lines(cls, items: List[str], checked: bool = False) -> bytes:
+        return ("\n".join(cls._task_lines(items, checked)) + "\n").encode("utf-8")
+
+    @classmethod
+    def _task_board_chunks(
+        cls,
         backlog_items: List[str],
         done_items: List[str],
         bridge: Optional[Dict[str, List[str]]] = None,
-    ) -> str:
-        def task_lines(items: List[str], checked: bool = False) -> List[str]:
-            if not items:
-                return ["- [ ]"] if not checked else ["- [x]"]
-            mark = "x" if checked else " "
-            return [f"- [{mark}] {item}" for item in items]
-
-        lines = ["---", "kanban-plugin: list", "---", ""]
+    ) -> List[bytes]:
+        """Static scaffold stays pre-encoded; only dynamic sections are encoded."""
+        chunks = [_PREFIX_BYTES]
 
         if bridge:
-            lines.extend(
-                [
-                    "## Now",
-                    *task_lines(bridge.get("now", []), checked=False),
-                    "",
-                    "## Paused",
-                    *task_lines(bridge.get("paused", []), checked=False),
-                    "",
-                    "## Captured from Reality",
-                    *task_lines(bridge.get("captured", []), checked=False),
-                    "",
-                    "## Next 3",
-                    *task_lines(bridge.get("next", []), checked=False),
-                    "",
-                ]
-            )
-
-        lines.extend(
-            [
-                "## Focus",
-                "",
-                "",
-                "## Creative",
-                "",
-                "",
-                "## Light",
-                "",
-                "",
-                "## Recovery",
-                "",
-                "",
-                "## Reflect",
-                "",
-                "",
-                "## Backlog",
-            ]
-        )
+            sections = {
+                key: "\n".join(cls._task_lines(bridge.get(key, [])))
+                for key in ("now", "paused", "captured", "next")
+            }
+            chunks.append(_BRIDGE_TEMPLATE.format(**sections).encode("utf-8"))
 
-        lines.extend(task_lines(backlog_items, checked=False))
-        lines.extend(["", "## Reconsider", "- [ ]", "", "## Done Today"])
-        lines.extend(task_lines(done_items, checked=True))
-        lines.extend(
+        chunks.extend(
             [
-                "",
-                "## Admin",
-                "- [ ]",
-                "",
-                "",
-                "%% kanban:settings",
-                "```",
-                '{"kanban-plugin":"list","list-collapse":[false,null,false,false,false,false]}',
-                "```",
-                "%%",
-                "",
+                _MID_BYTES,
+                cls._encode_lines(backlog_items, checked=False),
+                _RECONSIDER_BYTES,
+                cls._encode_lines(done_items, checked=True),
+                _SUFFIX_BYTES,
             ]
         )
-        return "\n".join(lines)
+        return chunks
+
+    @classmethod
+    def render_task_board_bytes(
+        cls,
+        backlog_items: List[str],
+        done_items: List[str],
+        bridge: Optional[Dict[str, List[str]]] = None,
+    ) -> bytes:
+        return b"".join(cls._task_board_chunks(backlog_items, done_items, bridge))
 
     @staticmethod
     def goals_board_template() -> str:
@@ -1,28 +1,68 @@
+import atexit
 import sqlite3
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Shared by the per-date queries so sqlite3's statement cache reuses one
+# prepared statement across every date in a sync.
+_SQL_EVENTS_FOR_DATE = """
+    SELECT timestamp, event_type, category, activity, context, raw_input
+    FROM events
+    WHERE date(timestamp) = date(?)
+    ORDER BY timestamp
+"""
+
+# Event rows are handed out as sqlite3.Row (read by column name, no per-row
+# dict copy); the bundle builds plain dicts since it drops a helper column.
+EventRow = Union[sqlite3.Row, Dict[str, Any]]
+
+
+class SyncBundle(NamedTuple):
+    """Rows needed by a combined daily-note + Kanban sync, from one query."""
+
+    today_events: List[Dict[str, Any]]
+    today_done_rows: List[Tuple[str, str]]
+    goal_rows: List[Tuple[str, str, str]]
 
 
 class EventRepository:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            # Per-connection tuning only; the journal mode belongs to the
+            # agent service, which owns context.db
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA cache_size = -20000")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+            atexit.register(self.close)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
     def _fetchall(
         self, query: str, params: Tuple[Any, ...] = ()
     ) -> List[Tuple[Any, ...]]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+        return self._connection().execute(query, params).fetchall()
 
-    def _fetchall_dicts(
-        self, query: str, params: Tuple[Any, ...] = ()
-    ) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    def _iter_batched(
+        self, query: str, params: Tuple[Any, ...] = (), batch_size: int = 1000
+    ) -> Iterator[Tuple[Any, ...]]:
+        cursor = self._connection().execute(query, params)
+        cursor.arraysize = batch_size
+        while True:
+            chunk = cursor.fetchmany()
+            if not chunk:
+                break
+            yield from chunk
 
     def get_today_done_rows(self) -> List[Tuple[str, str]]:
         today = datetime.now().strftime("%Y-%m-%d")
@@ -31,7 +71,7 @@ class EventRepository:
             SELECT activity, category
             FROM events
             WHERE date(timestamp) = date(?)
-              AND lower(event_type) = 'done'
+              AND event_type = 'done'
             ORDER BY timestamp
             """,
             (today,),
@@ -39,10 +79,10 @@ class EventRepository:
 
     def get_bridge_rows(
         self, lookback_days: int
-    ) -> List[Tuple[str, str, str, str, str]]:
-        return self._fetchall(
+    ) -> Iterator[Tuple[str, str, str, str, str]]:
+        return self._iter_batched(
             """
-            SELECT timestamp, lower(event_type), upper(category), activity, raw_input
+            SELECT activity, event_type, category, timestamp, raw_input
             FROM events
             WHERE datetime(timestamp) >= datetime('now', ?)
             ORDER BY datetime(timestamp), id
@@ -55,23 +95,47 @@ class EventRepository:
             """
             SELECT activity, context, raw_input
             FROM events
-            WHERE upper(category) = 'GOAL'
+            WHERE category = 'GOAL'
             ORDER BY timestamp
             """
         )
 
-    def get_today_events(self) -> List[Dict[str, Any]]:
+    def get_sync_bundle(self) -> SyncBundle:
         today = datetime.now().strftime("%Y-%m-%d")
-        return self._fetchall_dicts(
+        rows = self._connection().execute(
             """
-            SELECT timestamp, event_type, category, activity, context, raw_input
+            SELECT 1 AS is_today, timestamp, event_type, category, activity,
+                   context, raw_input
             FROM events
             WHERE date(timestamp) = date(?)
+            UNION ALL
+            SELECT 0, timestamp, event_type, category, activity,
+                   context, raw_input
+            FROM events
+            WHERE category = 'GOAL' AND date(timestamp) IS NOT date(?)
             ORDER BY timestamp
             """,
-            (today,),
+            (today, today),
         )
 
+        today_events: List[Dict[str, Any]] = []
+        today_done_rows: List[Tuple[str, str]] = []
+        goal_rows: List[Tuple[str, str, str]] = []
+        for row in rows:
+            if row["is_today"]:
+                event = dict(row)
+                del event["is_today"]
+                today_events.append(event)
+                if row["event_type"] == "done":
+                    today_done_rows.append((row["activity"], row["category"]))
+            if row["category"] == "GOAL":
+                goal_rows.append((row["activity"], row["context"], row["raw_input"]))
+        return SyncBundle(today_events, today_done_rows, goal_rows)
+
+    def get_today_events(self) -> List[sqlite3.Row]:
+        today = datetime.now().strftime("%Y-%m-%d")
+        return self._fetchall(_SQL_EVENTS_FOR_DATE, (today,))
+
     def get_all_dates(self) -> List[str]:
         rows = self._fetchall(
             """
@@ -82,13 +146,15 @@ class EventRepository:
         )
         return [row[0] for row in rows]
 
-    def get_events_for_date(self, date: str) -> List[Dict[str, Any]]:
-        return self._fetchall_dicts(
+    def get_events_for_date(self, date: str) -> List[sqlite3.Row]:
+        return self._fetchall(_SQL_EVENTS_FOR_DATE, (date,))
+
+    def iter_events_ordered(self) -> Iterator[sqlite3.Row]:
+        return self._iter_batched(
             """
-            SELECT timestamp, event_type, category, activity, context, raw_input
+            SELECT date(timestamp) as date, timestamp, event_type, category,
+                   activity, context, raw_input
             FROM events
-            WHERE date(timestamp) = date(?)
-            ORDER BY timestamp
-            """,
-            (date,),
+            ORDER BY date(timestamp), timestamp
+            """
         )
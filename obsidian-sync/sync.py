@@ -5,21 +5,120 @@ One-way sync: log → Obsidian (projection layer)
 
 import re
 import os
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 
 try:
-    from .repository import EventRepository
+    from .repository import EventRepository, EventRow, SyncBundle
     from .projectors import KanbanProjector
     from .renderers import BoardRenderer
 except ImportError:
-    from repository import EventRepository
+    from repository import EventRepository, EventRow, SyncBundle
     from projectors import KanbanProjector
     from renderers import BoardRenderer
 
+# ``[^\S\n]`` is whitespace that stays on one line, so the pattern can scan
+# the whole file with ``finditer`` without matching across line breaks.
+_TODO_LINE_RE = re.compile(
+    r"^[^\S\n]*-[^\S\n]*\[([^\S\n]*x[^\S\n]*|[^\S\n]*)\][^\S\n]*(.+)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_GOAL_STRIP_RE = re.compile(r"^[-\s\[\]x]+")
+_GOAL_NONALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_GOAL_WS_RE = re.compile(r"\s+")
+_BOARD_HEADER_RE = re.compile(
+    r"^(?:## (?:Short term|Medium Term|Long Term|Come back to)|%% kanban:settings)",
+    re.MULTILINE,
+)
+
+_WRITE_WORKERS = 8
+_RENDER_PROCESSES = min(8, os.cpu_count() or 1)
+# Each render worker is a fresh interpreter that re-imports this module; below
+# this many dates that startup costs more than rendering on the writer threads.
+_PROCESS_RENDER_MIN_DATES = 64
+# fork() from a threaded process can deadlock the child, so render workers
+# start from a clean interpreter instead.
+_RENDER_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_HDR_ACTIVITY = b"\n\n## Activity Log\n\n"
+_HDR_SUMMARY = b"\n\n## Summary\n\n"
+_FOOTER_SEP = b"\n\n---\n\n"
+_GENERATED_STAMP = b"*Generated: "
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+
+_ENV_LOADED = False
+
+
+def _ensure_env_loaded(env_path: Path) -> None:
+    """Load the project .env once per process."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    load_dotenv(env_path)
+    _ENV_LOADED = True
+
+
+def _write_file_bytes(path: Path, data: bytes) -> None:
+    """Write bytes with raw os calls, bypassing the TextIOWrapper layer."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _without_stamp(data: bytes) -> bytes:
+    return data.rpartition(_GENERATED_STAMP)[0] or data
+
+
+def _write_if_changed(path: Path, data: bytes, ignore_stamp: bool = False) -> bool:
+    """
+    Write data unless the file already holds identical bytes.
+    With ignore_stamp, a differing trailing "*Generated: ...*" line alone
+    does not count as a change.
+    """
+    try:
+        if path.stat().st_size == len(data):
+            existing = path.read_bytes()
+            if ignore_stamp:
+                existing, data_cmp = _without_stamp(existing), _without_stamp(data)
+            else:
+                data_cmp = data
+            if existing == data_cmp:
+                return False
+    except FileNotFoundError:
+        pass
+
+    _write_file_bytes(path, data)
+    return True
+
+
+def _write_daily_note(note_path: Path, content: bytes) -> bool:
+    """Single write path for daily notes: one raw write, skipped if unchanged."""
+    return _write_if_changed(note_path, content, ignore_stamp=True)
+
+
+def _render_and_write(
+    note_path: Path, date: str, events: List[Dict[str, Any]], generated_at: datetime
+) -> bool:
+    """Process-pool worker: render one day's note and write it if changed."""
+    content = ObsidianSync._generate_note_bytes(
+        datetime.fromisoformat(date), events, generated_at=generated_at
+    )
+    return _write_daily_note(note_path, content)
+
 
 class ObsidianSync:
     """
@@ -29,7 +128,7 @@ class ObsidianSync:
 
     def __init__(self, vault_path: Optional[str] = None, db_path: Optional[str] = None):
         base_dir = Path(__file__).resolve().parent.parent
-        load_dotenv(base_dir / ".env")
+        _ensure_env_loaded(base_dir / ".env")
 
         resolved_vault = vault_path or os.getenv(
             "OBSIDIAN_VAULT_PATH", "~/vaults/personal"
@@ -47,42 +146,165 @@ class ObsidianSync:
         # Ensure directories exist
         self.daily_notes_path.mkdir(parents=True, exist_ok=True)
         self.kanban_path.mkdir(parents=True, exist_ok=True)
-        self.repository = EventRepository(self.db_path)
-        self.projector = KanbanProjector()
-        self.renderer = BoardRenderer()
+        self._repository: Optional[EventRepository] = None
+        self._projector: Optional[KanbanProjector] = None
+        self._renderer: Optional[BoardRenderer] = None
+        # Whether the last sync_today call actually rewrote the note
+        self.last_note_changed = False
+        self._todo_cache: Optional[
+            Tuple[Tuple[int, int], Tuple[Tuple[str, ...], Tuple[str, ...]]]
+        ] = None
+
+    @property
+    def repository(self) -> EventRepository:
+        if self._repository is None:
+            self._repository = EventRepository(self.db_path)
+        return self._repository
+
+    @property
+    def projector(self) -> KanbanProjector:
+        if self._projector is None:
+            self._projector = KanbanProjector()
+        return self._projector
+
+    @property
+    def renderer(self) -> BoardRenderer:
+        if self._renderer is None:
+            self._renderer = BoardRenderer()
+        return self._renderer
+
+    def close(self) -> None:
+        """Release the cached database connection."""
+        if self._repository is not None:
+            self._repository.close()
+
+    def fetch_sync_bundle(self) -> Optional[SyncBundle]:
+        """
+        Fetch today's events and all GOAL events in one round trip so
+        sync_today and the Kanban sync can share it. None on failure,
+        in which case each sync falls back to its own queries.
+        """
+        try:
+            return self.repository.get_sync_bundle()
+        except Exception as e:
+            print(f"Error fetching sync bundle: {e}")
+            return None
 
-    def sync_today(self) -> str:
+    def sync_today(self, bundle: Optional[SyncBundle] = None) -> str:
         """Sync today's events to Obsidian"""
         today = datetime.now()
-        note_path = self.daily_notes_path / f"{today.strftime('%Y-%m-%d')}.md"
 
         # Get today's events from SQLite
-        events = self._get_today_events()
-
-        # Generate note content
-        content = self._generate_note_content(today, events)
+        events = bundle.today_events if bundle else self._get_today_events()
 
-        # Write to file
-        note_path.write_text(content)
+        # Render and write through the same path as sync_all
+        note_path, content = self._render_daily_note(
+            today.strftime("%Y-%m-%d"), events, generated_at=today
+        )
+        self.last_note_changed = _write_daily_note(note_path, content)
 
         return str(note_path)
 
     def sync_all(self) -> List[str]:
         """Sync all events to Obsidian (useful for initial setup)"""
+        generated_at = datetime.now()
+        try:
+            if _RENDER_PROCESSES > 1:
+                # Served by the date index; only long histories repay the
+                # cost of starting worker processes
+                date_count = len(self.repository.get_all_dates())
+                if date_count >= _PROCESS_RENDER_MIN_DATES:
+                    return self._render_notes_in_processes(
+                        generated_at, min(_RENDER_PROCESSES, date_count)
+                    )
+            # Few dates (or a single core): render here, write on threads
+            return self._write_daily_notes(
+                self._render_daily_note(date, events, generated_at)
+                for date, events in self._iter_events_grouped_by_date()
+            )
+        except Exception as e:
+            print(f"Error fetching all events, falling back to per-date sync: {e}")
+            return self._sync_all_per_date()
+
+    def _render_notes_in_processes(
+        self, generated_at: datetime, workers: int
+    ) -> List[str]:
+        """
+        Render and write each date's note in a process pool.
+        Rows are read in this process only (the SQLite connection is never
+        shared) and shipped per date as plain dicts; at most two dates per
+        worker are queued so memory stays bounded on long histories.
+        """
         updated_notes = []
+        in_flight: deque = deque()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(_RENDER_START_METHOD),
+        ) as pool:
+            for date, events in self._iter_events_grouped_by_date():
+                note_path = self.daily_notes_path / f"{date}.md"
+                in_flight.append(
+                    pool.submit(
+                        _render_and_write,
+                        note_path,
+                        date,
+                        [dict(event) for event in events],
+                        generated_at,
+                    )
+                )
+                updated_notes.append(str(note_path))
+                if len(in_flight) > 2 * workers:
+                    in_flight.popleft().result()
+            for future in in_flight:
+                future.result()
+
+        return updated_notes
 
+    def _iter_events_grouped_by_date(
+        self,
+    ) -> Iterator[Tuple[str, Iterator[EventRow]]]:
+        """
+        Stream events from one ordered scan, one day's worth at a time.
+        Each group is a live iterator over the cursor, so it must be consumed
+        before the next date is requested.
+        """
+        rows = self.repository.iter_events_ordered()
+        for date, group in groupby(rows, key=itemgetter("date")):
+            if date:
+                yield date, group
+
+    def _sync_all_per_date(self) -> List[str]:
+        """Sync all events one date at a time (one query per date)."""
         # Get all unique dates
         dates = self._get_all_dates()
 
-        for date in dates:
-            events = self._get_events_for_date(date)
-            note_path = self.daily_notes_path / f"{date}.md"
+        generated_at = datetime.now()
+        return self._write_daily_notes(
+            self._render_daily_note(date, self._get_events_for_date(date), generated_at)
+            for date in dates
+        )
+
+    def _render_daily_note(
+        self, date: str, events: Iterable[EventRow], generated_at: datetime
+    ) -> Tuple[Path, bytes]:
+        """Render the daily note for a YYYY-MM-DD date as encoded bytes."""
+        note_path = self.daily_notes_path / f"{date}.md"
 
-            content = self._generate_note_content(
-                datetime.strptime(date, "%Y-%m-%d"), events
-            )
-            note_path.write_text(content)
-            updated_notes.append(str(note_path))
+        content = self._generate_note_bytes(
+            datetime.fromisoformat(date), events, generated_at=generated_at
+        )
+        return note_path, content
+
+    def _write_daily_notes(self, notes: Iterable[Tuple[Path, bytes]]) -> List[str]:
+        """Write notes concurrently as they are rendered, preserving input order."""
+        updated_notes = []
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as pool:
+            futures = []
+            for note_path, content in notes:
+                futures.append(pool.submit(_write_daily_note, note_path, content))
+                updated_notes.append(str(note_path))
+            for future in futures:
+                future.result()
 
         return updated_notes
 
@@ -91,7 +313,7 @@ class ObsidianSync:
         return self.sync_kanban_projections_with_mode(None)
 
     def sync_kanban_projections_with_mode(
-        self, mode: Optional[str] = None
+        self, mode: Optional[str] = None, bundle: Optional[SyncBundle] = None
     ) -> List[str]:
         """
         Sync Kanban projections.
@@ -103,32 +325,47 @@ class ObsidianSync:
             (mode or os.getenv("OBSIDIAN_KANBAN_MODE", "prod")).strip().lower()
         )
         updated = []
+        # One directory listing per sync replaces the individual exists() stats;
+        # it is not kept across syncs because this method creates board files.
+        kanban_names = self._kanban_entry_names()
         task_board_path, goals_board_path = self._resolve_kanban_board_paths(
-            resolved_mode
+            resolved_mode, kanban_names
         )
         guide_mode = resolved_mode == "guide"
 
         backlog_items, done_items = self._load_project_todo_items()
-        done_events = self._get_today_done_events()
+        done_events = self._get_today_done_events(bundle)
+        seen_done = set(done_items)
         for item in done_events:
-            if item not in done_items:
+            if item not in seen_done:
                 done_items.append(item)
+                seen_done.add(item)
         bridge = self._build_bridge_projection(backlog_items) if guide_mode else None
-        task_board_content = self._generate_task_board(
-            backlog_items, done_items, bridge=bridge
+        _write_if_changed(
+            task_board_path,
+            self.renderer.render_task_board_bytes(backlog_items, done_items, bridge),
         )
-        task_board_path.write_text(task_board_content)
         updated.append(str(task_board_path))
 
-        goal_items = self._get_goal_events()
-        if not goals_board_path.exists():
-            goals_board_path.write_text(self._generate_goals_board())
+        goal_items = self._get_goal_events(bundle)
+        if goals_board_path.name not in kanban_names:
+            goals_board_path.write_bytes(self._generate_goals_board().encode("utf-8"))
         self._merge_goals_into_board(goals_board_path, goal_items)
         updated.append(str(goals_board_path))
 
         return updated
 
-    def _resolve_kanban_board_paths(self, mode: str) -> Tuple[Path, Path]:
+    def _kanban_entry_names(self) -> Set[str]:
+        """List file names in the Kanban folder with a single scandir."""
+        try:
+            with os.scandir(self.kanban_path) as entries:
+                return {entry.name for entry in entries}
+        except FileNotFoundError:
+            return set()
+
+    def _resolve_kanban_board_paths(
+        self, mode: str, names: Optional[Set[str]] = None
+    ) -> Tuple[Path, Path]:
         """Resolve task/goals board paths based on sync mode."""
         if mode == "guide":
             return (
@@ -145,11 +382,14 @@ class ObsidianSync:
             self.kanban_path / "Goals Board.md",
         ]
 
+        if names is None:
+            names = self._kanban_entry_names()
+
         task_board = next(
-            (p for p in task_candidates if p.exists()), task_candidates[1]
+            (p for p in task_candidates if p.name in names), task_candidates[1]
         )
         goals_board = next(
-            (p for p in goals_candidates if p.exists()), goals_candidates[1]
+            (p for p in goals_candidates if p.name in names), goals_candidates[1]
         )
         return task_board, goals_board
 
@@ -158,17 +398,19 @@ class ObsidianSync:
         backlog = []
         done = []
 
-        if not self.project_todo_path.exists():
+        try:
+            st = self.project_todo_path.stat()
+        except FileNotFoundError:
             return backlog, done
 
-        lines = self.project_todo_path.read_text().splitlines()
-        pattern = re.compile(r"^\s*-\s*\[(\s*x\s*|\s*)\]\s*(.+)$", re.IGNORECASE)
-
-        for line in lines:
-            match = pattern.match(line)
-            if not match:
-                continue
+        # Reuse the last parse while TODO.md is unchanged; hand out copies
+        # because callers extend the done list.
+        signature = (st.st_mtime_ns, st.st_size)
+        if self._todo_cache is not None and self._todo_cache[0] == signature:
+            cached_backlog, cached_done = self._todo_cache[1]
+            return list(cached_backlog), list(cached_done)
 
+        for match in _TODO_LINE_RE.finditer(self.project_todo_path.read_text()):
             marker = match.group(1).strip().lower()
             item_text = match.group(2).strip()
             if not item_text:
@@ -179,12 +421,17 @@ class ObsidianSync:
             else:
                 backlog.append(item_text)
 
+        self._todo_cache = (signature, (tuple(backlog), tuple(done)))
         return backlog, done
 
-    def _get_today_done_events(self) -> List[str]:
+    def _get_today_done_events(self, bundle: Optional[SyncBundle] = None) -> List[str]:
         """Read today's DONE events from context DB for Kanban Done Today."""
         try:
-            rows = self.repository.get_today_done_rows()
+            rows = (
+                bundle.today_done_rows
+                if bundle
+                else self.repository.get_today_done_rows()
+            )
             items = []
             for activity, category in rows:
                 if activity:
@@ -196,15 +443,6 @@ class ObsidianSync:
         except Exception:
             return []
 
-    def _generate_task_board(
-        self,
-        backlog_items: List[str],
-        done_items: List[str],
-        bridge: Optional[Dict[str, List[str]]] = None,
-    ) -> str:
-        """Generate Kanban list board with your preferred columns."""
-        return self.renderer.render_task_board(backlog_items, done_items, bridge)
-
     def _build_bridge_projection(
         self, backlog_items: List[str], lookback_days: int = 7
     ) -> Dict[str, List[str]]:
@@ -219,10 +457,12 @@ class ObsidianSync:
         """Generate goals Kanban board template."""
         return self.renderer.goals_board_template()
 
-    def _get_goal_events(self) -> Dict[str, List[str]]:
+    def _get_goal_events(
+        self, bundle: Optional[SyncBundle] = None
+    ) -> Dict[str, List[str]]:
         """Read GOAL events and map to goals board sections."""
         try:
-            rows = self.repository.get_goal_rows()
+            rows = bundle.goal_rows if bundle else self.repository.get_goal_rows()
             return self.projector.map_goal_events(rows)
         except Exception:
             return {
@@ -236,67 +476,75 @@ class ObsidianSync:
         self, board_path: Path, goal_items: Dict[str, List[str]]
     ) -> None:
         """Merge new goal items into existing goals board sections without rewriting manual entries."""
+        if not any(goal_items.values()):
+            return
+
         content = board_path.read_text()
+        headers = [(m.start(), m.group()) for m in _BOARD_HEADER_RE.finditer(content)]
+        edits: List[Tuple[int, str]] = []
+        normalized_new = {
+            item: self._normalize_goal_line(f"- [ ] {item}")
+            for items in goal_items.values()
+            for item in items
+        }
 
         for section, items in goal_items.items():
             if not items:
                 continue
 
-            next_headers = [
-                "## Short term",
-                "## Medium Term",
-                "## Long Term",
-                "## Come back to",
-                "%% kanban:settings",
-            ]
             section_header = f"## {section}"
-            start_idx = content.find(section_header)
-            if start_idx == -1:
+            idx = next(
+                (i for i, (_, text) in enumerate(headers) if text == section_header),
+                None,
+            )
+            if idx is None:
                 continue
 
-            end_idx = len(content)
-            for header in next_headers:
-                if header == section_header:
-                    continue
-                candidate = content.find(header, start_idx + len(section_header))
-                if candidate != -1:
-                    end_idx = min(end_idx, candidate)
+            start_idx = headers[idx][0]
+            end_idx = next(
+                (pos for pos, text in headers[idx + 1 :] if text != section_header),
+                len(content),
+            )
 
             section_block = content[start_idx:end_idx]
-            normalized_section_lines = {
-                self._normalize_goal_line(line)
-                for line in section_block.splitlines()
-                if line.strip().startswith("- [")
-            }
+            normalized_section_lines = set()
+            for line in section_block.splitlines():
+                if line.lstrip().startswith("- ["):
+                    normalized_section_lines.add(self._normalize_goal_line(line))
             append_lines = []
             for item in items:
-                line = f"- [ ] {item}"
-                if self._normalize_goal_line(line) not in normalized_section_lines:
-                    append_lines.append(line)
+                normalized = normalized_new[item]
+                if normalized not in normalized_section_lines:
+                    append_lines.append(f"- [ ] {item}")
+                    normalized_section_lines.add(normalized)
 
             if not append_lines:
                 continue
 
-            insertion_point = end_idx
-            content = (
-                content[:insertion_point]
-                + "\n"
-                + "\n".join(append_lines)
-                + "\n"
-                + content[insertion_point:]
-            )
+            edits.append((end_idx, "\n" + "\n".join(append_lines) + "\n"))
 
-        board_path.write_text(content)
+        if not edits:
+            return
+
+        # Splice every insertion into the original text in one pass.
+        parts: List[str] = []
+        last = 0
+        for offset, text in sorted(edits, key=itemgetter(0)):
+            parts.append(content[last:offset])
+            parts.append(text)
+            last = offset
+        parts.append(content[last:])
+        board_path.write_bytes("".join(parts).encode("utf-8"))
 
     def _normalize_goal_line(self, line: str) -> str:
         """Normalize a goal line for dedup checks."""
         normalized = line.lower().strip()
-        normalized = re.sub(r"^[-\s\[\]x]+", "", normalized)
-        normalized = re.sub(r"[^a-z0-9\s]", "", normalized)
-        normalized = re.sub(r"\s+", " ", normalized)
+        normalized = _GOAL_STRIP_RE.sub("", normalized)
+        normalized = _GOAL_NONALNUM_RE.sub("", normalized)
+        normalized = _GOAL_WS_RE.sub(" ", normalized)
         return normalized
 
-    def _get_today_events(self) -> List[Dict[str, Any]]:
+    def _get_today_events(self) -> List[EventRow]:
         """Fetch today's events from SQLite"""
         try:
             return self.repository.get_today_events()
@@ -312,7 +560,7 @@ class ObsidianSync:
             print(f"Error fetching dates: {e}")
             return []
 
-    def _get_events_for_date(self, date: str) -> List[Dict[str, Any]]:
+    def _get_events_for_date(self, date: str) -> List[EventRow]:
         """Fetch events for a specific date"""
         try:
             return self.repository.get_events_for_date(date)
@@ -320,86 +568,90 @@ class ObsidianSync:
             print(f"Error fetching events for {date}: {e}")
             return []
 
-    def _generate_note_content(
-        self, date: datetime, events: List[Dict[str, Any]]
-    ) -> str:
-        """Generate Obsidian markdown content"""
-        lines = [
-            f"# {date.strftime('%Y-%m-%d %A')}",
-            "",
-            "## Activity Log",
-            "",
-        ]
+    @classmethod
+    def _generate_note_bytes(
+        cls,
+        date: datetime,
+        events: Iterable[EventRow],
+        generated_at: Optional[datetime] = None,
+    ) -> bytes:
+        """
+        Generate Obsidian markdown as UTF-8, reusing pre-encoded headings.
+        Events are consumed in a single pass; the summary is tallied as the
+        lines are built, so a streamed iterator works as well as a list.
+        """
+        if generated_at is None:
+            generated_at = datetime.now()
 
-        if not events:
-            lines.append("*No activities logged today.*")
-        else:
-            for event in events:
-                timestamp = event.get("timestamp", "")
-                category = event.get("category", "UNKNOWN")
-                activity = event.get("activity", "unknown")
-                context = event.get("context", "")
-                raw_input = event.get("raw_input", "")
-
-                # Format time
-                try:
-                    dt = datetime.fromisoformat(timestamp)
-                    time_str = dt.strftime("%H:%M")
-                except:
-                    time_str = "??"
-
-                # Format event line
-                event_line = f"- **{time_str}** "
-
-                if category:
-                    event_line += f"[[{category}]] "
-
-                event_line += f"**{activity}**"
-
-                if context:
-                    event_line += f" ({context})"
-
-                lines.append(event_line)
-
-                # Add raw input as quote if different
-                if raw_input and raw_input != f"{category} {activity}".strip():
-                    lines.append(f"  > {raw_input}")
-
-        # Add summary section
-        lines.extend(
-            [
-                "",
-                "## Summary",
-                "",
-                self._generate_summary(events),
-                "",
-                "---",
-                "",
-                f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*",
-            ]
-        )
+        lines = []
+        categories: Counter = Counter()
+        # Days repeat a handful of categories; build each wikilink once
+        cat_links: Dict[Any, str] = {}
 
-        return "\n".join(lines)
+        for event in events:
+            timestamp = event["timestamp"]
+            category = event["category"]
+            activity = event["activity"]
+            context = event["context"]
+            raw_input = event["raw_input"]
 
-    def _generate_summary(self, events: List[Dict[str, Any]]) -> str:
-        """Generate summary statistics"""
-        if not events:
-            return "No activities."
+            # Format time
+            time_str = cls._format_event_time(timestamp)
 
-        # Count by category
-        categories = {}
-        for event in events:
-            cat = event.get("category", "UNKNOWN")
-            categories[cat] = categories.get(cat, 0) + 1
+            # Format event line
+            cat_part = cat_links.get(category)
+            if cat_part is None:
+                cat_part = cat_links[category] = f"[[{category}]] " if category else ""
+            ctx_part = f" ({context})" if context else ""
+            lines.append(f"- **{time_str}** {cat_part}**{activity}**{ctx_part}")
+
+            # Add raw input as quote if different
+            if raw_input and raw_input != f"{category} {activity}".strip():
+                lines.append(f"  > {raw_input}")
 
-        lines = [f"**Total activities:** {len(events)}"]
+            categories[category] += 1
+
+        if not lines:
+            lines.append("*No activities logged today.*")
+
+        return b"".join(
+            (
+                f"# {date.strftime('%Y-%m-%d %A')}".encode("utf-8"),
+                _HDR_ACTIVITY,
+                "\n".join(lines).encode("utf-8"),
+                _HDR_SUMMARY,
+                cls._generate_summary(categories).encode("utf-8"),
+                _FOOTER_SEP,
+                _GENERATED_STAMP,
+                generated_at.strftime("%Y-%m-%d %H:%M*").encode("utf-8"),
+            )
+        )
+
+    @staticmethod
+    def _format_event_time(timestamp: Any) -> str:
+        """HH:MM of an ISO timestamp, sliced directly when the layout allows."""
+        if (
+            isinstance(timestamp, str)
+            and len(timestamp) >= 16
+            and timestamp[10] in "T "
+            and timestamp[13] == ":"
+        ):
+            return timestamp[11:16]
+        try:
+            return datetime.fromisoformat(timestamp).strftime("%H:%M")
+        except (TypeError, ValueError):
+            return "??"
+
+    @staticmethod
+    def _generate_summary(categories: Counter) -> str:
+        """Generate summary statistics from per-category event counts"""
+        if not categories:
+            return "No activities."
 
-        if categories:
-            lines.append("**Breakdown:**")
-            for cat, count in sorted(
-                categories.items(), key=lambda x: x[1], reverse=True
-            ):
-                lines.append(f"- {cat}: {count}")
+        lines = [f"**Total activities:** {sum(categories.values())}"]
+        lines.append("**Breakdown:**")
+        for cat, count in categories.most_common():
+            lines.append(f"- {cat}: {count}")
 
         return "\n".join(lines)
 
@@ -427,8 +679,9 @@ if __name__ == "__main__":
             print(f"Updated: {board}")
     else:
         print("Syncing today's events...")
-        note = sync.sync_today()
-        print(f"Updated: {note}")
-        boards = sync.sync_kanban_projections_with_mode(None)
+        bundle = sync.fetch_sync_bundle()
+        note = sync.sync_today(bundle)
+        print(f"{'Updated' if sync.last_note_changed else 'Unchanged'}: {note}")
+        boards = sync.sync_kanban_projections_with_mode(None, bundle)
         for board in boards:
             print(f"Updated: {board}")
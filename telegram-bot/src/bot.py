@@ -4,13 +4,19 @@ Emits events and renders projections, never owns state
 """
 
 import asyncio
+import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Any, Awaitable, Callable, Dict
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
 import aiohttp
-from aiogram import Bot, Dispatcher, F
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.filters import Command
 from aiogram.types import (
     CallbackQuery,
@@ -18,20 +24,172 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     Message,
 )
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import uvloop
+except ImportError:  # optional speedup; not available on Windows
+    uvloop = None
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # optional speedup
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    json_loads = json.loads
+
+
+def _telegram_json_dumps(obj: Any) -> str:
+    # aiogram JSON-encodes nested fields (e.g. reply markup) into form text
+    return json_dumps(obj).decode()
+
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
 )
 logger = logging.getLogger(__name__)
 
-AGENT_SERVICE_URL = "http://localhost:8000"
+# Default to an IP literal: aiohttp skips name resolution entirely, and the
+# agent service (uvicorn on 0.0.0.0) is IPv4-only, so "localhost" could try ::1
+# first. AGENT_SERVICE_URL in the environment overrides it; a host name there
+# is resolved once per HTTP_DNS_CACHE_SECONDS.
+AGENT_SERVICE_URL = "http://127.0.0.1:8000"
 REQUEST_TIMEOUT_SECONDS = 30
+HTTP_POOL_LIMIT = 32
+# Must stay below the agent service's SERVER_KEEPALIVE_SECONDS so a pooled
+# connection is never one the server has already closed.
+HTTP_KEEPALIVE_SECONDS = 75
+HTTP_DNS_CACHE_SECONDS = 300
+# Extra attempts when the TCP connect itself fails (e.g. the agent service is
+# restarting). Nothing was sent, so this is safe even for /confirm.
+HTTP_CONNECT_RETRIES = 2
+# Read-only calls (/query) also retry a dropped connection or a
+# gateway/overload status. /parse is not one: the server records an LLM
+# decision per request, so a replay after a late disconnect would duplicate it.
+# The backoff is jittered so chats that failed together do not hit the
+# recovering service in lockstep.
+HTTP_RETRY_STATUSES = frozenset({502, 503, 504})
+HTTP_RETRY_BACKOFF_SECONDS = 0.1
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Telegram side: one pool serves the long poll and every outbound send, so a
+# held getUpdates connection never starves replies. A longer poll means fewer
+# empty getUpdates round trips while the bot is idle.
+TELEGRAM_POOL_LIMIT = 100
+TELEGRAM_POLL_TIMEOUT_SECONDS = 30
+# The session-wide total timeout raises asyncio.TimeoutError, which is not an
+# aiohttp.ClientError, so transport failures are caught as this pair.
+AGENT_REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
 GAME_NUDGE_PRIMARY_DELAY = timedelta(hours=2)
 GAME_NUDGE_FOLLOWUP_DELAY = timedelta(hours=1)
 GAME_NUDGE_MIN_SESSION = timedelta(hours=1)
+CHAT_STATE_IDLE_TTL = timedelta(days=2)
+CHAT_STATE_SWEEP_INTERVAL = timedelta(hours=1)
+# Session timing runs on the event loop's monotonic clock, in seconds
+_PRIMARY_DELAY_S = GAME_NUDGE_PRIMARY_DELAY.total_seconds()
+_FOLLOWUP_DELAY_S = GAME_NUDGE_FOLLOWUP_DELAY.total_seconds()
+_MIN_SESSION_S = GAME_NUDGE_MIN_SESSION.total_seconds()
+_IDLE_TTL_S = CHAT_STATE_IDLE_TTL.total_seconds()
+_SWEEP_INTERVAL_S = CHAT_STATE_SWEEP_INTERVAL.total_seconds()
+QUERY_PREFIXES = (
+    "what",
+    "how",
+    "show",
+    "tell",
+    "today",
+    "yesterday",
+    "ratio",
+    "summary",
+    "sessions",
+    "timeline",
+)
+# One alternation over the prefixes, anchored and whole-word, so "showered"
+# or "however" read as activities rather than queries. Matched against the raw
+# text, so the common path never builds a lowercased copy.
+QUERY_PREFIX_RE = re.compile(r"\s*(?:%s)\b" % "|".join(QUERY_PREFIXES), re.IGNORECASE)
+YES_REPLIES = frozenset({"yes", "y", "yeah", "yep", "correct", "right"})
+NO_REPLIES = frozenset({"no", "n", "nope", "wrong", "incorrect"})
+# Anything longer can't be a yes/no reply, so it skips both set lookups
+_MAX_CONFIRM_REPLY_LEN = max(map(len, YES_REPLIES | NO_REPLIES))
+NUDGE_STOP_REPLIES = frozenset({"done", "no", "skip", "not now", "nah"})
+# [epoch seconds of next local midnight, "YYYY-MM-DD"]; the hot path is one
+# time.time() comparison, and the key is rebuilt only when the day rolls over
+_TODAY_CACHE: list = [0.0, ""]
+
+# Callback payloads of the confirm keyboard; the handler filter and dispatch
+# key off the same constants so the shared markup has one definition.
+CONFIRM_YES = "confirm_yes"
+CONFIRM_NO = "confirm_no"
+SESSION_EXPIRED_TEXT = "❌ Session expired. Please try again."
+# Immutable once built; shared by every suggestion and correction prompt
+CONFIRM_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(text="✓ Yes, log it", callback_data=CONFIRM_YES),
+            InlineKeyboardButton(text="✗ No, correct", callback_data=CONFIRM_NO),
+        ]
+    ]
+)
+
+
+@dataclass(slots=True)
+class GameNudgeState:
+    """Game-session nudge bookkeeping for one chat."""
+
+    # Loop-clock time (seconds) the current game session started
+    session_started_at: float | None = None
+    waiting_response: bool = False
+    flow_stopped: bool = False
+    followup_used: bool = False
+    last_sent_day: str = ""
+    # The one pending nudge; the follow-up is only armed after the primary fired
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass(slots=True)
+class ChatState:
+    """Everything the bot tracks for one chat, found with a single lookup."""
+
+    pending: Dict[str, Any] | None = None
+    original_input: str = ""
+    awaiting_correction: bool = False
+    # Set while a /confirm for this chat is in flight
+    confirming: bool = False
+    game: GameNudgeState = field(default_factory=GameNudgeState)
+    # Loop-clock time of the last access through AgentBot._chat
+    last_touched: float = 0.0
+
+    def clear_pending(self) -> None:
+        self.pending = None
+        self.original_input = ""
+        self.awaiting_correction = False
+
+
+@dataclass(slots=True)
+class ConfirmResult:
+    """The fields of a /confirm response the bot acts on."""
+
+    status: str | None = None
+    message: str | None = None
+    suggestion: str = ""
+    details: Dict[str, Any] | None = None
+    # "session_info" may be present but null; only its presence matters
+    has_session_info: bool = False
+    session_info: Any = None
+    motivation: str | None = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ConfirmResult":
+        get = data.get
+        return cls(
+            status=get("status"),
+            message=get("message"),
+            suggestion=get("suggestion", ""),
+            details=get("details"),
+            has_session_info="session_info" in data,
+            session_info=get("session_info"),
+            motivation=get("motivation"),
+        )
 
 
 class HTTPError(Exception):
@@ -40,75 +198,168 @@ class HTTPError(Exception):
         self.error_text = error_text
 
 
+class BatchingPostQueue:
+    """
+    Coalesces concurrent POSTs to one agent endpoint.
+    The first submit schedules a flush with call_soon, so every request made
+    before the loop gets back to it goes out together: a lone request uses
+    the single endpoint, several use the batch endpoint and receive their
+    results by position.
+    """
+
+    def __init__(
+        self,
+        post: Callable[[str, Any], Awaitable[Any]],
+        path: str,
+        batch_path: str,
+    ):
+        self._post = post
+        self._path = path
+        self._batch_path = batch_path
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flushes: set[asyncio.Task] = set()
+
+    def submit(self, payload: Dict[str, Any]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._start_flush)
+        self._pending.append((payload, future))
+        return future
+
+    def _start_flush(self) -> None:
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [await self._post(self._path, batch[0][0])]
+            else:
+                results = await self._post(
+                    self._batch_path, [payload for payload, _ in batch]
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # A short, non-list or non-dict response can't be matched to callers
+        # by position; fail every waiter rather than leave any pending.
+        if not (
+            isinstance(results, list)
+            and len(results) == len(batch)
+            and all(isinstance(result, dict) for result in results)
+        ):
+            error = HTTPError("Malformed response from the agent service")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result.get("status") == "error":
+                future.set_exception(HTTPError(result.get("detail", "")))
+            else:
+                future.set_result(result)
+
+
 class AgentBot:
+    # Handler filters are stateless; build them once for every bot instance
+    CMD_START = Command("start")
+    CMD_HELP = Command("help")
+    CMD_RATIO = Command("ratio")
+    CMD_TODAY = Command("today")
+    CONFIRM_CALLBACK = F.data.in_(frozenset({CONFIRM_YES, CONFIRM_NO}))
+    TEXT_MESSAGE = F.text
+    SLASH_PREFIXED = F.text.startswith("/")
+
     def __init__(self):
         self.token = os.getenv("TELEGRAM_BOT_TOKEN")
         if not self.token:
-            raise ValueError("TELEGRAM_BOT_TOKEN not set in environment")
+            # Only read .env when the environment doesn't already configure
+            # us, so importing the module stays side-effect free.
+            from dotenv import load_dotenv
 
-        self.bot = Bot(token=self.token)
-        self.dp = Dispatcher()
+            load_dotenv()
+            self.token = os.getenv("TELEGRAM_BOT_TOKEN")
+        if not self.token:
+            raise ValueError("TELEGRAM_BOT_TOKEN not set in environment")
+        self.agent_service_url = os.getenv("AGENT_SERVICE_URL", AGENT_SERVICE_URL)
+
+        # Same codec as the agent service calls, for every Telegram response
+        # (including each getUpdates batch) and outbound reply markup
+        session = AiohttpSession(
+            limit=TELEGRAM_POOL_LIMIT,
+            json_loads=json_loads,
+            json_dumps=_telegram_json_dumps,
+        )
+        self.bot = Bot(token=self.token, session=session)
+        self.dp = self._build_dispatcher()
         self.http: aiohttp.ClientSession | None = None
 
-        self.pending_suggestion: Dict[int, Dict[str, Any]] = {}
-        self.original_input: Dict[int, str] = {}
-        self.awaiting_correction: set[int] = set()
-
-        self.game_state: Dict[int, Dict[str, Any]] = {}
-        self.game_tasks: Dict[str, asyncio.Task] = {}
+        self.chats: Dict[int, ChatState] = {}
+        # Game-session clock; rebound to the running loop's clock in _run so
+        # session timestamps share a timebase with call_later.
+        self._loop_time: Callable[[], float] = time.monotonic
+        self._parse_queue = BatchingPostQueue(self._post_json, "/parse", "/parse_batch")
+        # A chat has at most one pending nudge: the follow-up is only armed
+        # after the primary has fired. Its loop timer handle lives in the
+        # chat's game state, so cancelling is O(1). A Task exists only while a
+        # fired nudge is being sent.
+        self.nudge_tasks: set[asyncio.Task] = set()
+        self._sweep_handle: asyncio.TimerHandle | None = None
 
     @staticmethod
     def _today_key() -> str:
-        return datetime.now().strftime("%Y-%m-%d")
-
-    @staticmethod
-    def _confirm_keyboard() -> InlineKeyboardMarkup:
-        return InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="✓ Yes, log it", callback_data="confirm_yes"
-                    ),
-                    InlineKeyboardButton(
-                        text="✗ No, correct", callback_data="confirm_no"
-                    ),
-                ]
-            ]
+        if time.time() < _TODAY_CACHE[0]:
+            return _TODAY_CACHE[1]
+        now = datetime.now()
+        # Naive local .timestamp() goes through mktime, so DST days are handled
+        midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min)
+        _TODAY_CACHE[:] = [
+            midnight.timestamp(),
+            f"{now.year:04d}-{now.month:02d}-{now.day:02d}",
+        ]
+        return _TODAY_CACHE[1]
+
+    def _chat(self, chat_id: int) -> ChatState:
+        state = self.chats.get(chat_id)
+        if state is None:
+            state = self.chats[chat_id] = ChatState()
+        state.last_touched = self._loop_time()
+        return state
+
+    def _sweep_chats(self) -> None:
+        """Drop chats idle past the TTL with nothing pending, then re-arm."""
+        cutoff = self._loop_time() - _IDLE_TTL_S
+        stale = [
+            chat_id
+            for chat_id, state in self.chats.items()
+            if state.last_touched < cutoff
+            and not state.pending
+            and state.game.timer is None
+        ]
+        for chat_id in stale:
+            del self.chats[chat_id]
+        if stale:
+            logger.info("Evicted %d idle chat states", len(stale))
+
+        self._sweep_handle = asyncio.get_running_loop().call_later(
+            _SWEEP_INTERVAL_S, self._sweep_chats
         )
 
-    @staticmethod
-    def _is_game_event(parsed_event: Dict[str, Any]) -> bool:
-        return (parsed_event.get("category") or "").upper() == "GAME"
-
-    def _is_game_start(self, parsed_event: Dict[str, Any]) -> bool:
-        return (
-            parsed_event.get("action") or ""
-        ).lower() == "start" and self._is_game_event(parsed_event)
-
-    def _is_non_game_start(self, parsed_event: Dict[str, Any]) -> bool:
-        return (
-            parsed_event.get("action") or ""
-        ).lower() == "start" and not self._is_game_event(parsed_event)
-
-    def _is_game_end(self, parsed_event: Dict[str, Any]) -> bool:
-        return (
-            parsed_event.get("action") or ""
-        ).lower() == "done" and self._is_game_event(parsed_event)
-
-    def _get_game_state(self, chat_id: int) -> Dict[str, Any]:
-        if chat_id not in self.game_state:
-            self.game_state[chat_id] = {}
-        return self.game_state[chat_id]
-
-    @staticmethod
-    def _session_started_at(game_state: Dict[str, Any]) -> datetime | None:
-        raw = game_state.get("game_session_started_at")
-        if not raw:
-            return None
-        try:
-            return datetime.fromisoformat(raw)
-        except Exception:
-            return None
+    def _get_game_state(self, chat_id: int) -> GameNudgeState:
+        return self._chat(chat_id).game
 
     @staticmethod
     def _primary_job_name(chat_id: int) -> str:
@@ -119,90 +370,125 @@ class AgentBot:
         return f"game_nudge_followup:{chat_id}"
 
     def _cancel_game_jobs(self, chat_id: int) -> None:
-        for name in (self._primary_job_name(chat_id), self._followup_job_name(chat_id)):
-            task = self.game_tasks.pop(name, None)
-            if task and not task.done():
-                task.cancel()
-
-    def _schedule_task(
-        self, name: str, delay: timedelta, callback, chat_id: int
-    ) -> None:
-        async def runner() -> None:
-            try:
-                await asyncio.sleep(delay.total_seconds())
-                await callback(chat_id)
-            except asyncio.CancelledError:
-                return
-
-        self._cancel_named_task(name)
-        self.game_tasks[name] = asyncio.create_task(runner(), name=name)
+        game_state = self._get_game_state(chat_id)
+        if game_state.timer is not None:
+            game_state.timer.cancel()
+            game_state.timer = None
+
+    def _schedule_task(self, name: str, delay: float, callback, chat_id: int) -> None:
+        # Replaces whichever nudge was pending for the chat
+        self._cancel_game_jobs(chat_id)
+        handle = asyncio.get_running_loop().call_later(
+            delay, self._fire_timer, name, callback, chat_id
+        )
+        self._get_game_state(chat_id).timer = handle
 
-    def _cancel_named_task(self, name: str) -> None:
-        task = self.game_tasks.pop(name, None)
-        if task and not task.done():
-            task.cancel()
+    def _fire_timer(self, name: str, callback, chat_id: int) -> None:
+        # Synchronous gate: no-longer-wanted nudges end here without ever
+        # allocating a Task.
+        game_state = self._get_game_state(chat_id)
+        game_state.timer = None
+        if not self._nudge_due(game_state):
+            return
+        task = asyncio.create_task(callback(chat_id), name=name)
+        self.nudge_tasks.add(task)
+        task.add_done_callback(self.nudge_tasks.discard)
 
-    async def _post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _post_json(
+        self, path: str, payload: Any, *, idempotent: bool = False
+    ) -> Any:
         if self.http is None:
             raise RuntimeError("HTTP session not initialized")
 
-        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
-        async with self.http.post(
-            f"{AGENT_SERVICE_URL}{path}", json=payload, timeout=timeout
-        ) as response:
-            text = await response.text()
-            if response.status != 200:
-                raise HTTPError(text)
+        retry_errors = (
+            (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError)
+            if idempotent
+            else aiohttp.ClientConnectorError
+        )
+        data = json_dumps(payload)
+        for attempt in range(HTTP_CONNECT_RETRIES + 1):
+            last_attempt = attempt == HTTP_CONNECT_RETRIES
             try:
-                return await response.json(content_type=None)
-            except Exception:
-                raise HTTPError(text)
+                async with self.http.post(
+                    path, data=data, headers=JSON_HEADERS
+                ) as response:
+                    body = await response.read()
+            except retry_errors as e:
+                if last_attempt:
+                    raise
+                logger.warning("Retrying %s after connection failure: %s", path, e)
+            else:
+                if (
+                    last_attempt
+                    or not idempotent
+                    or response.status not in HTTP_RETRY_STATUSES
+                ):
+                    break
+                logger.warning("Retrying %s after HTTP %s", path, response.status)
+            await asyncio.sleep(
+                HTTP_RETRY_BACKOFF_SECONDS * 2**attempt
+                + random.uniform(0, HTTP_RETRY_BACKOFF_SECONDS / 2)
+            )
+        if response.status != 200:
+            raise HTTPError(body.decode("utf-8", "replace"))
+        try:
+            return json_loads(body)
+        except ValueError:
+            raise HTTPError(body.decode("utf-8", "replace"))
 
-    async def _handle_post_log_hooks(
+    def _handle_post_log_hooks(
         self, parsed_event: Dict[str, Any], chat_id: int
     ) -> None:
-        game_state = self._get_game_state(chat_id)
         action = (parsed_event.get("action") or "").lower()
+        is_game = (parsed_event.get("category") or "").upper() == "GAME"
+        is_start = action == "start"
+        is_done = action == "done"
+        # Only starts and game ends touch nudge state; anything else (e.g. a
+        # finished task) must not allocate state for the chat.
+        if not (is_start or (is_done and is_game)):
+            return
 
-        if self._is_game_start(parsed_event):
+        game_state = self._get_game_state(chat_id)
+        if is_start and is_game:
             self._cancel_game_jobs(chat_id)
-            game_state["game_session_started_at"] = datetime.now().isoformat()
-            game_state["game_nudge_waiting_response"] = False
-            game_state["game_nudge_flow_stopped"] = False
-            game_state["game_nudge_followup_used"] = False
+            game_state.session_started_at = self._loop_time()
+            game_state.waiting_response = False
+            game_state.flow_stopped = False
+            game_state.followup_used = False
 
-            if game_state.get("game_nudge_last_sent_day") == self._today_key():
+            if game_state.last_sent_day == self._today_key():
                 return
 
             self._schedule_task(
                 self._primary_job_name(chat_id),
-                GAME_NUDGE_PRIMARY_DELAY,
+                _PRIMARY_DELAY_S,
                 self._send_primary_game_nudge,
                 chat_id,
             )
             return
 
-        if self._is_non_game_start(parsed_event) or self._is_game_end(parsed_event):
-            started_at = self._session_started_at(game_state)
-            if started_at and datetime.now() - started_at < GAME_NUDGE_MIN_SESSION:
-                game_state["game_nudge_flow_stopped"] = True
+        started_at = game_state.session_started_at
+        if started_at is not None and self._loop_time() - started_at < _MIN_SESSION_S:
+            game_state.flow_stopped = True
 
-            self._cancel_game_jobs(chat_id)
-            game_state["game_session_started_at"] = None
-            game_state["game_nudge_waiting_response"] = False
-            if action == "done":
-                game_state["game_nudge_flow_stopped"] = True
+        self._cancel_game_jobs(chat_id)
+        game_state.session_started_at = None
+        game_state.waiting_response = False
+        if is_done:
+            game_state.flow_stopped = True
+
+    @staticmethod
+    def _nudge_due(game_state: GameNudgeState) -> bool:
+        """
+        The timer's own delay is authoritative: any restart of the session
+        cancels its pending timer, so only stop/end state needs checking.
+        """
+        return not game_state.flow_stopped and game_state.session_started_at is not None
 
     async def _send_primary_game_nudge(self, chat_id: int) -> None:
         game_state = self._get_game_state(chat_id)
-        if game_state.get("game_nudge_flow_stopped"):
-            return
-
-        started_at = self._session_started_at(game_state)
-        if not started_at:
-            return
-
-        if datetime.now() - started_at < GAME_NUDGE_PRIMARY_DELAY:
+        # Re-checked here: a handler may have run between the gate and now
+        if not self._nudge_due(game_state):
             return
 
         await self.bot.send_message(
@@ -212,17 +498,13 @@ class AgentBot:
                 "Want to `resume`, `still`, or `done` for today?"
             ),
         )
-        game_state["game_nudge_waiting_response"] = True
-        game_state["game_nudge_followup_used"] = False
-        game_state["game_nudge_last_sent_day"] = self._today_key()
+        game_state.waiting_response = True
+        game_state.followup_used = False
+        game_state.last_sent_day = self._today_key()
 
     async def _send_followup_game_nudge(self, chat_id: int) -> None:
         game_state = self._get_game_state(chat_id)
-        if game_state.get("game_nudge_flow_stopped"):
-            return
-
-        started_at = self._session_started_at(game_state)
-        if not started_at:
+        if not self._nudge_due(game_state):
             return
 
         await self.bot.send_message(
@@ -232,46 +514,37 @@ class AgentBot:
                 "No pressure."
             ),
         )
-        game_state["game_nudge_waiting_response"] = True
-        game_state["game_nudge_followup_used"] = True
+        game_state.waiting_response = True
+        game_state.followup_used = True
 
     async def _handle_game_nudge_response(
-        self, message: Message, user_input: str
+        self, message: Message, game_state: GameNudgeState, reply: str
     ) -> bool:
         chat_id = message.chat.id
-        game_state = self._get_game_state(chat_id)
-        if not game_state.get("game_nudge_waiting_response"):
-            return False
-
-        reply = user_input.lower().strip()
-        if reply in {"done", "no", "skip", "not now", "nah"}:
+        if reply in NUDGE_STOP_REPLIES or reply == "resume":
+            # Both replies end the flow: settle timers and state in this tick,
+            # then make the one network call the user sees.
             self._cancel_game_jobs(chat_id)
-            game_state["game_nudge_flow_stopped"] = True
-            game_state["game_nudge_waiting_response"] = False
-            game_state["game_session_started_at"] = None
-            await message.answer("Got it. No more reminders today.")
-            return True
-
-        if reply == "resume":
-            self._cancel_game_jobs(chat_id)
-            game_state["game_nudge_flow_stopped"] = True
-            game_state["game_nudge_waiting_response"] = False
-            game_state["game_session_started_at"] = None
-            await message.answer(
-                "Nice. Log your next start when you're ready, and we'll continue from there."
-            )
+            game_state.flow_stopped = True
+            game_state.waiting_response = False
+            game_state.session_started_at = None
+            if reply == "resume":
+                await message.answer(
+                    "Nice. Log your next start when you're ready, and we'll continue from there."
+                )
+            else:
+                await message.answer("Got it. No more reminders today.")
             return True
 
         if reply == "still":
-            if game_state.get("game_nudge_followup_used"):
-                game_state["game_nudge_waiting_response"] = False
+            game_state.waiting_response = False
+            if game_state.followup_used:
                 await message.answer("All good. I won't ping again today.")
                 return True
 
-            game_state["game_nudge_waiting_response"] = False
             self._schedule_task(
                 self._followup_job_name(chat_id),
-                GAME_NUDGE_FOLLOWUP_DELAY,
+                _FOLLOWUP_DELAY_S,
                 self._send_followup_game_nudge,
                 chat_id,
             )
@@ -281,54 +554,56 @@ class AgentBot:
         return False
 
     async def _request_confirm_result(
-        self, chat_id: int, parsed_event: Dict[str, Any], user_response: str
-    ) -> Dict[str, Any]:
-        return await self._post_json(
+        self, state: ChatState, parsed_event: Dict[str, Any], user_response: str
+    ) -> ConfirmResult:
+        result = await self._post_json(
             "/confirm",
             {
                 "parsed_event": parsed_event,
                 "user_response": user_response,
-                "original_input": self.original_input.get(chat_id, ""),
+                "original_input": state.original_input,
             },
         )
+        return ConfirmResult.from_json(result)
 
     async def _handle_confirm_result(
         self,
         *,
-        result: Dict[str, Any],
+        result: ConfirmResult,
+        state: ChatState,
         chat_id: int,
         parsed_event: Dict[str, Any],
-        send_message: Callable[[str, InlineKeyboardMarkup | None], Awaitable[None]],
+        # Bound Message.answer or Message.edit_text; called as (text, reply_markup=)
+        send_message: Callable[..., Awaitable[Any]],
         include_session_info: bool,
     ) -> bool:
-        status = result.get("status")
+        status = result.status
 
         if status == "corrected":
-            self.pending_suggestion[chat_id] = result["details"]
+            state.pending = result.details
             await send_message(
-                f"🔄 Corrected:\n➤ {result['suggestion']}\n\nIs this correct now?",
-                self._confirm_keyboard(),
+                f"🔄 Corrected:\n➤ {result.suggestion}\n\nIs this correct now?",
+                reply_markup=CONFIRM_KEYBOARD,
             )
             return False
 
         if status == "logged":
-            msg = result["message"]
-            if include_session_info and "session_info" in result:
-                msg += f"\n\n📊 Session info: {result['session_info']}"
-            if result.get("motivation"):
-                msg += f"\n\n🔥 {result['motivation']}"
-            await send_message(msg, None)
-            await self._handle_post_log_hooks(parsed_event, chat_id)
+            parts = [result.message]
+            if include_session_info and result.has_session_info:
+                parts.append(f"\n\n📊 Session info: {result.session_info}")
+            if result.motivation:
+                parts.append(f"\n\n🔥 {result.motivation}")
+            # The event is already in the log: settle nudge state in this tick,
+            # then make the one network call the user waits on.
+            self._handle_post_log_hooks(parsed_event, chat_id)
+            await send_message("".join(parts), reply_markup=None)
             return True
 
-        await send_message(result.get("message", "Could not log this event."), None)
+        await send_message(
+            result.message or "Could not log this event.", reply_markup=None
+        )
         return True
 
-    def _clear_pending(self, chat_id: int) -> None:
-        self.pending_suggestion.pop(chat_id, None)
-        self.original_input.pop(chat_id, None)
-        self.awaiting_correction.discard(chat_id)
-
     async def start_command(self, message: Message) -> None:
         await message.answer(
             "👋 Welcome to your Event Agent!\n\n"
@@ -357,31 +632,30 @@ class AgentBot:
         await self._handle_query(message, "What did I work on today?")
 
     async def handle_message(self, message: Message) -> None:
-        if not message.text:
-            return
-
+        # Registered behind TEXT_MESSAGE, so message.text is always non-empty
         chat_id = message.chat.id
         user_input = message.text
         logger.info("Received from chat %s: %s", chat_id, user_input)
 
-        if await self._handle_confirmation(message, user_input):
-            return
-        if await self._handle_game_nudge_response(message, user_input):
-            return
-
-        query_prefixes = (
-            "what",
-            "how",
-            "show",
-            "tell",
-            "today",
-            "yesterday",
-            "ratio",
-            "summary",
-            "sessions",
-            "timeline",
-        )
-        if user_input.lower().strip().startswith(query_prefixes):
+        # Most messages are plain logs from chats with nothing pending; one
+        # lookup decides whether either reply handler needs to run at all.
+        state = self.chats.get(chat_id)
+        if state is not None and (state.pending or state.game.waiting_response):
+            # Normalize once for both reply handlers, which only ever run
+            # with their own precondition already checked here
+            normalized = user_input.lower().strip()
+            if state.pending:
+                if await self._handle_confirmation(
+                    message, state, user_input, normalized
+                ):
+                    return
+            if state.game.waiting_response:
+                if await self._handle_game_nudge_response(
+                    message, state.game, normalized
+                ):
+                    return
+
+        if QUERY_PREFIX_RE.match(user_input):
             await self._handle_query(message, user_input)
             return
 
@@ -390,9 +664,8 @@ class AgentBot:
     async def _parse_and_suggest(self, message: Message, user_input: str) -> None:
         chat_id = message.chat.id
         try:
-            result = await self._post_json(
-                "/parse",
-                {"input": user_input, "use_llm": False, "user_id": str(chat_id)},
+            result = await self._parse_queue.submit(
+                {"input": user_input, "use_llm": False, "user_id": str(chat_id)}
             )
 
             if result.get("status") == "needs_clarification":
@@ -401,14 +674,15 @@ class AgentBot:
                 )
                 return
 
-            self.pending_suggestion[chat_id] = result["details"]
-            self.original_input[chat_id] = user_input
+            state = self._chat(chat_id)
+            state.pending = result["details"]
+            state.original_input = user_input
 
             await message.answer(
                 f"🤔 I understood:\n➤ {result['suggestion']}\n\nIs this correct?",
-                reply_markup=self._confirm_keyboard(),
+                reply_markup=CONFIRM_KEYBOARD,
             )
-        except aiohttp.ClientError as e:
+        except AGENT_REQUEST_ERRORS as e:
             logger.error("Error parsing via agent service: %s", e)
             await message.answer(
                 "❌ Sorry, I couldn't parse that right now. Try again."
@@ -418,153 +692,201 @@ class AgentBot:
                 f"❌ Sorry, I couldn't parse that. Error: {e.error_text}"
             )
 
-    async def _handle_confirmation(self, message: Message, user_input: str) -> bool:
-        chat_id = message.chat.id
-        pending = self.pending_suggestion.get(chat_id)
-        if not pending:
+    async def _handle_confirmation(
+        self, message: Message, state: ChatState, user_input: str, user_lower: str
+    ) -> bool:
+        if len(user_lower) > _MAX_CONFIRM_REPLY_LEN and not state.awaiting_correction:
             return False
-
-        user_lower = user_input.lower().strip()
-        if user_lower in {"yes", "y", "yeah", "yep", "correct", "right"}:
-            await self._confirm_event(message, pending, "Yes")
+        pending = state.pending
+
+        if user_lower in YES_REPLIES:
+            await self._confirm_event(
+                message.chat.id,
+                pending,
+                "Yes",
+                send_message=message.answer,
+                include_session_info=True,
+            )
             return True
 
-        if user_lower in {"no", "n", "nope", "wrong", "incorrect"}:
-            self.awaiting_correction.add(chat_id)
+        if user_lower in NO_REPLIES:
+            state.awaiting_correction = True
             await message.answer(
                 "📝 What should I have understood?\n"
                 "(e.g., 'It was practice, not theory' or 'The activity is pandas-dataframes')"
             )
             return True
 
-        if chat_id in self.awaiting_correction:
-            await self._confirm_event(message, pending, user_input)
-            self.awaiting_correction.discard(chat_id)
+        if state.awaiting_correction:
+            await self._confirm_event(
+                message.chat.id,
+                pending,
+                user_input,
+                send_message=message.answer,
+                include_session_info=True,
+            )
+            state.awaiting_correction = False
             return True
 
         return False
 
     async def _confirm_event(
-        self, message: Message, parsed_event: Dict[str, Any], user_response: str
+        self,
+        chat_id: int,
+        parsed_event: Dict[str, Any],
+        user_response: str,
+        *,
+        # Bound Message.answer or Message.edit_text; see _handle_confirm_result
+        send_message: Callable[..., Awaitable[Any]],
+        include_session_info: bool,
     ) -> None:
-        chat_id = message.chat.id
+        """
+        Shared by typed replies and the inline keyboard's confirm button.
+        The chat's state is looked up once here and passed down the path.
+        """
+        state = self._chat(chat_id)
+        if state.confirming:
+            # Updates are handled concurrently; a double-tapped button or a
+            # repeated "yes" must not log the same event twice.
+            return
+        state.confirming = True
         should_clear_pending = True
         try:
             result = await self._request_confirm_result(
-                chat_id, parsed_event, user_response
+                state, parsed_event, user_response
             )
-
-            async def sender(text: str, markup: InlineKeyboardMarkup | None) -> None:
-                await message.answer(text, reply_markup=markup)
-
             should_clear_pending = await self._handle_confirm_result(
                 result=result,
+                state=state,
                 chat_id=chat_id,
                 parsed_event=parsed_event,
-                send_message=sender,
-                include_session_info=True,
+                send_message=send_message,
+                include_session_info=include_session_info,
             )
         except HTTPError as e:
-            await message.answer(f"❌ Failed to log event. Error: {e.error_text}")
-        except aiohttp.ClientError as e:
+            await send_message(f"❌ Failed to log event. Error: {e.error_text}")
+        except AGENT_REQUEST_ERRORS as e:
             logger.error("Error confirming event: %s", e)
-            await message.answer("❌ Failed to log event. Please try again.")
+            await send_message("❌ Failed to log event. Please try again.")
         finally:
+            state.confirming = False
             if should_clear_pending:
-                self._clear_pending(chat_id)
+                state.clear_pending()
 
     async def _handle_query(self, message: Message, query_text: str) -> None:
         try:
-            result = await self._post_json("/query", {"query": query_text})
+            result = await self._post_json(
+                "/query", {"query": query_text}, idempotent=True
+            )
             await message.answer(result.get("message", "No response"))
         except HTTPError:
             await message.answer("❌ Sorry, I couldn't process that query.")
-        except aiohttp.ClientError as e:
+        except AGENT_REQUEST_ERRORS as e:
             logger.error("Error querying: %s", e)
             await message.answer(
                 "⏱️ Query timed out. Try again, or check that the agent service is running."
             )
 
     async def button_callback(self, callback: CallbackQuery) -> None:
-        await callback.answer()
+        # The ack is its own round trip to Telegram; send it alongside the
+        # work below instead of in front of it.
+        ack = asyncio.ensure_future(callback.answer())
+        try:
+            await self._handle_button(callback)
+        finally:
+            await ack
+
+    async def _handle_button(self, callback: CallbackQuery) -> None:
         if callback.message is None:
             return
 
-        chat_id = callback.message.chat.id
-        pending = self.pending_suggestion.get(chat_id)
+        state = self.chats.get(callback.message.chat.id)
+        pending = state.pending if state is not None else None
         if not pending:
-            await callback.message.edit_text("❌ Session expired. Please try again.")
+            if callback.message.text != SESSION_EXPIRED_TEXT:
+                await callback.message.edit_text(SESSION_EXPIRED_TEXT)
             return
 
-        if callback.data == "confirm_yes":
-            await self._confirm_event_from_callback(callback, pending, "Yes")
+        if callback.data == CONFIRM_YES:
+            await self._confirm_event(
+                callback.message.chat.id,
+                pending,
+                "Yes",
+                send_message=callback.message.edit_text,
+                include_session_info=False,
+            )
             return
 
-        if callback.data == "confirm_no":
-            self.awaiting_correction.add(chat_id)
+        if callback.data == CONFIRM_NO:
+            # Repeat taps on "No" would re-send an identical edit, which
+            # Telegram rejects as "message is not modified".
+            if state.awaiting_correction:
+                return
+            state.awaiting_correction = True
             await callback.message.edit_text(
                 "📝 What should I have understood?\n"
                 "(Reply with the correct description)"
             )
 
-    async def _confirm_event_from_callback(
-        self, callback: CallbackQuery, parsed_event: Dict[str, Any], user_response: str
-    ) -> None:
-        if callback.message is None:
-            return
-
-        chat_id = callback.message.chat.id
-        should_clear_pending = True
-        try:
-            result = await self._request_confirm_result(
-                chat_id, parsed_event, user_response
-            )
-
-            async def sender(text: str, markup: InlineKeyboardMarkup | None) -> None:
-                await callback.message.edit_text(text, reply_markup=markup)
-
-            should_clear_pending = await self._handle_confirm_result(
-                result=result,
-                chat_id=chat_id,
-                parsed_event=parsed_event,
-                send_message=sender,
-                include_session_info=False,
-            )
-        except HTTPError as e:
-            await callback.message.edit_text(f"❌ Error: {e.error_text}")
-        except aiohttp.ClientError as e:
-            logger.error("Error in callback confirm: %s", e)
-            await callback.message.edit_text("❌ Failed to log event.")
-        finally:
-            if should_clear_pending:
-                self._clear_pending(chat_id)
+    def _build_dispatcher(self) -> Dispatcher:
+        """Wire every handler once; _run only has to start polling."""
+        # Commands sit behind one router-level "/" check, so free text skips
+        # every Command filter; anything unmatched falls through to chat.
+        commands_router = Router(name="commands")
+        commands_router.message.filter(self.SLASH_PREFIXED)
+        commands_router.message.register(self.start_command, self.CMD_START)
+        commands_router.message.register(self.help_command, self.CMD_HELP)
+        commands_router.message.register(self.ratio_command, self.CMD_RATIO)
+        commands_router.message.register(self.today_command, self.CMD_TODAY)
+
+        chat_router = Router(name="chat")
+        chat_router.callback_query.register(self.button_callback, self.CONFIRM_CALLBACK)
+        chat_router.message.register(self.handle_message, self.TEXT_MESSAGE)
+
+        dp = Dispatcher()
+        dp.include_routers(commands_router, chat_router)
+        return dp
 
     async def _run(self) -> None:
-        self.http = aiohttp.ClientSession()
-
-        self.dp.message.register(self.start_command, Command("start"))
-        self.dp.message.register(self.help_command, Command("help"))
-        self.dp.message.register(self.ratio_command, Command("ratio"))
-        self.dp.message.register(self.today_command, Command("today"))
-        self.dp.callback_query.register(
-            self.button_callback, F.data.in_({"confirm_yes", "confirm_no"})
+        self._loop_time = asyncio.get_running_loop().time
+
+        # Every request goes to the single agent service host, so keep a
+        # warm keep-alive pool for it and resolve its name once.
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        )
+        self.http = aiohttp.ClientSession(
+            base_url=self.agent_service_url,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+        )
+
+        self._sweep_handle = asyncio.get_running_loop().call_later(
+            _SWEEP_INTERVAL_S, self._sweep_chats
         )
-        self.dp.message.register(self.handle_message, F.text)
 
         logger.info("Starting aiogram bot...")
         try:
-            await self.dp.start_polling(self.bot)
+            await self.dp.start_polling(
+                self.bot, polling_timeout=TELEGRAM_POLL_TIMEOUT_SECONDS
+            )
         finally:
-            for task in self.game_tasks.values():
-                if not task.done():
-                    task.cancel()
-            self.game_tasks.clear()
+            if self._sweep_handle is not None:
+                self._sweep_handle.cancel()
+            for task in self.nudge_tasks:
+                task.cancel()
             if self.http is not None:
                 await self.http.close()
             await self.bot.session.close()
 
     def run(self) -> None:
-        asyncio.run(self._run())
+        if uvloop is not None:
+            uvloop.run(self._run())
+        else:
+            asyncio.run(self._run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE / "telegram-bot" / "src"))
+
+from bot import BatchingPostQueue, HTTPError
+
+
+def _submit_batch(response, count):
+    """Queue `count` payloads behind a stub POST that returns `response`"""
+
+    async def post(path, payload):
+        return response
+
+    async def run():
+        queue = BatchingPostQueue(post, "/parse", "/parse_batch")
+        futures = [queue.submit({"input": str(i)}) for i in range(count)]
+        # Bounded wait: a regression here would otherwise hang the suite
+        return await asyncio.wait_for(
+            asyncio.gather(*futures, return_exceptions=True), timeout=1
+        )
+
+    return asyncio.run(run())
+
+
+def test_batch_results_are_matched_by_position():
+    results = _submit_batch([{"i": 0}, {"status": "error", "detail": "bad"}], 2)
+
+    assert results[0] == {"i": 0}
+    assert isinstance(results[1], HTTPError)
+    assert results[1].error_text == "bad"
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        [{"i": 0}],
+        {"detail": "not a list"},
+        [{"i": 0}, "not a dict", {"i": 2}],
+    ],
+)
+def test_malformed_batch_response_fails_every_waiter(response):
+    results = _submit_batch(response, 3)
+
+    assert all(isinstance(result, HTTPError) for result in results)
+
+
+def test_malformed_single_response_fails_the_waiter():
+    results = _submit_batch("not a dict", 1)
+
+    assert isinstance(results[0], HTTPError)
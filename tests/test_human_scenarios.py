@@ -1,3 +1,4 @@
+import os
 import sqlite3
 import tempfile
 from pathlib import Path
@@ -11,29 +12,40 @@ sys.path.insert(0, str(BASE / "obsidian-sync"))
 
 from parser import EventParser
 from main import _motivation_for_event
+import sync as sync_module
 from sync import ObsidianSync
 
 
-def _init_events_db(db_path: Path):
+_INSERT_EVENT = """
+    INSERT INTO events (timestamp, event_type, category, activity, context, raw_input, user_confirmed)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _init_events_db(db_path: Path, events=()):
+    """Create the events table and seed it in a single transaction"""
     conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            event_type TEXT,
-            category TEXT,
-            activity TEXT,
-            context TEXT,
-            raw_input TEXT,
-            user_confirmed BOOLEAN,
-            log_position INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    # Throwaway DB in a temp dir: skip the durability work
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA synchronous=OFF")
+    with conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                event_type TEXT,
+                category TEXT,
+                activity TEXT,
+                context TEXT,
+                raw_input TEXT,
+                user_confirmed BOOLEAN,
+                log_position INTEGER,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
         )
-        """
-    )
-    conn.commit()
+        conn.executemany(_INSERT_EVENT, events)
     conn.close()
 
 
@@ -76,27 +88,20 @@ def test_kanban_goal_board_updates_from_goal_events():
         vault = tmp_path / "vault"
         db = tmp_path / "context.db"
 
-        _init_events_db(db)
-
-        conn = sqlite3.connect(db)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO events (timestamp, event_type, category, activity, context, raw_input, user_confirmed)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                "2026-02-17T13:00:00",
-                "start",
-                "GOAL",
-                "LEARN_MUSIC_THEORY",
-                "SHORT_TERM",
-                "add goal short term learn music theory",
-                True,
-            ),
+        _init_events_db(
+            db,
+            [
+                (
+                    "2026-02-17T13:00:00",
+                    "start",
+                    "GOAL",
+                    "LEARN_MUSIC_THEORY",
+                    "SHORT_TERM",
+                    "add goal short term learn music theory",
+                    True,
+                )
+            ],
         )
-        conn.commit()
-        conn.close()
 
         sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
         updated = sync.sync_kanban_projections()
@@ -139,18 +144,12 @@ def test_guide_board_includes_intent_reality_bridge_sections():
         vault = tmp_path / "vault"
         db = tmp_path / "context.db"
 
-        _init_events_db(db)
-
-        conn = sqlite3.connect(db)
-        cur = conn.cursor()
-        cur.executemany(
-            """
-            INSERT INTO events (timestamp, event_type, category, activity, context, raw_input, user_confirmed)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        now = datetime.now()
+        _init_events_db(
+            db,
             [
                 (
-                    (datetime.now() - timedelta(hours=2)).isoformat(),
+                    (now - timedelta(hours=2)).isoformat(),
                     "start",
                     "TASK",
                     "PROGRAMMING_MANAGEMENT_SYSTEM",
@@ -159,7 +158,7 @@ def test_guide_board_includes_intent_reality_bridge_sections():
                     True,
                 ),
                 (
-                    (datetime.now() - timedelta(hours=1)).isoformat(),
+                    (now - timedelta(hours=1)).isoformat(),
                     "start",
                     "TASK",
                     "EATING",
@@ -169,8 +168,6 @@ def test_guide_board_includes_intent_reality_bridge_sections():
                 ),
             ],
         )
-        conn.commit()
-        conn.close()
 
         sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
         sync.sync_kanban_projections_with_mode("guide")
@@ -184,3 +181,185 @@ def test_guide_board_includes_intent_reality_bridge_sections():
         assert "## next 3" in content
         assert "programming management system" in content
         assert "eating" in content
+
+
+def test_sync_all_writes_one_note_per_event_date():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        _init_events_db(
+            db,
+            [
+                ("2026-02-16T09:00:00", "start", "THEORY", "PANDAS", None, None, True),
+                ("2026-02-17T10:30:00", "start", "PRACTICE", "RUST", None, None, True),
+                ("2026-02-17T08:15:00", "start", "TASK", "EMAILS", None, None, True),
+            ],
+        )
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        updated = sync.sync_all()
+
+        assert [Path(p).name for p in updated] == ["2026-02-16.md", "2026-02-17.md"]
+
+        content = (vault / "Daily" / "2026-02-17.md").read_text()
+        assert content.index("**08:15**") < content.index("**10:30**")
+        assert "**Total activities:** 2" in content
+        assert "PANDAS" not in content
+
+
+def test_sync_all_renders_long_histories_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(sync_module, "_RENDER_PROCESSES", 2)
+    monkeypatch.setattr(sync_module, "_PROCESS_RENDER_MIN_DATES", 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        _init_events_db(
+            db,
+            [
+                ("2026-02-16T09:00:00", "start", "THEORY", "PANDAS", None, None, True),
+                ("2026-02-17T10:30:00", "start", "PRACTICE", "RUST", None, None, True),
+            ],
+        )
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        calls = []
+        render_in_processes = sync._render_notes_in_processes
+
+        def spy(generated_at, workers):
+            calls.append(workers)
+            return render_in_processes(generated_at, workers)
+
+        monkeypatch.setattr(sync, "_render_notes_in_processes", spy)
+        updated = sync.sync_all()
+
+        assert calls == [2]
+        assert [Path(p).name for p in updated] == ["2026-02-16.md", "2026-02-17.md"]
+        assert "RUST" in (vault / "Daily" / "2026-02-17.md").read_text()
+
+
+def test_sync_all_skips_rewriting_unchanged_notes():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        _init_events_db(
+            db,
+            [("2026-02-16T09:00:00", "start", "THEORY", "PANDAS", None, None, True)],
+        )
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        sync.sync_all()
+
+        note = vault / "Daily" / "2026-02-16.md"
+        os.utime(note, (0, 0))
+        sync.sync_all()
+
+        assert note.stat().st_mtime == 0
+
+
+def test_sync_today_reports_whether_note_changed():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        _init_events_db(db)
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        sync.sync_today()
+        assert sync.last_note_changed is True
+
+        sync.sync_today()
+        assert sync.last_note_changed is False
+
+
+def test_goal_merge_inserts_into_each_section_in_one_pass():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        _init_events_db(db)
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        board = vault / "Kanban" / "Goals Board.md"
+        board.write_text(sync._generate_goals_board())
+
+        sync._merge_goals_into_board(
+            board,
+            {
+                "Short term": ["Learn Music theory", "Learn Go"],
+                "Medium Term": [],
+                "Long Term": ["Run a marathon"],
+                "Come back to": ["Fix bike"],
+            },
+        )
+
+        content = board.read_text()
+        short = content[
+            content.index("## Short term") : content.index("## Medium Term")
+        ]
+        long_term = content[
+            content.index("## Long Term") : content.index("## Come back to")
+        ]
+        come_back = content[
+            content.index("## Come back to") : content.index("%% kanban:settings")
+        ]
+        assert short.count("Learn Music theory") == 1
+        assert "- [ ] Learn Go" in short
+        assert "- [ ] Run a marathon" in long_term
+        assert "- [ ] Fix bike" in come_back
+
+
+def test_sync_bundle_matches_individual_queries():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        vault = tmp_path / "vault"
+        db = tmp_path / "context.db"
+
+        now = datetime.now()
+        _init_events_db(
+            db,
+            [
+                (
+                    "2026-01-05T09:00:00",
+                    "start",
+                    "GOAL",
+                    "LEARN_GO",
+                    "LONG_TERM",
+                    None,
+                    True,
+                ),
+                (
+                    (now - timedelta(minutes=30)).isoformat(),
+                    "done",
+                    "TASK",
+                    "LAUNDRY",
+                    None,
+                    None,
+                    True,
+                ),
+                (
+                    (now - timedelta(minutes=10)).isoformat(),
+                    "start",
+                    "GOAL",
+                    "READ",
+                    None,
+                    None,
+                    True,
+                ),
+            ],
+        )
+
+        sync = ObsidianSync(vault_path=str(vault), db_path=str(db))
+        bundle = sync.fetch_sync_bundle()
+
+        assert bundle is not None
+        assert bundle.today_events == [dict(row) for row in sync._get_today_events()]
+        assert sync._get_today_done_events(bundle) == sync._get_today_done_events()
+        assert sync._get_goal_events(bundle) == sync._get_goal_events()
@@ -2,43 +2,221 @@
 """
 Architecture Validation Script
 Validates that the implementation follows all invariants from the architecture document
+
+Use --only/--skip (repeatable) to select checks and --skip-tests to skip the
+unit test suites.
 """
+import argparse
+import hashlib
+import json
 import os
+import re
 import sys
 import tempfile
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+PROJECT_DIR = '/home/demi/.projects/basic-agent'
+# Everything the architecture checks read, relative to PROJECT_DIR
+PARSER_PY = Path('agent-service/src/parser.py')
+QUERY_ENGINE_PY = Path('agent-service/src/query_engine.py')
+RUST_MAIN = Path('Project-A-extension/src/main.rs')
+PROJECTIONS_RS = Path('Project-A-extension/src/projections.rs')
+BOT_PY = Path('telegram-bot/src/bot.py')
+SOURCE_FILES = (PARSER_PY, QUERY_ENGINE_PY, RUST_MAIN, PROJECTIONS_RS, BOT_PY)
+# Check results from earlier runs, reused while the files they read are
+# unchanged; lives in PROJECT_DIR
+RESULTS_CACHE_FILE = '.validate-cache.json'
+# Source-tree digest of each test suite's last green run; lives in PROJECT_DIR
+TEST_CACHE_FILE = '.validate-test-cache.json'
+# Build output, caches and runtime data: none of it changes what a suite tests
+TREE_SKIP_DIRS = frozenset({'__pycache__', 'target', 'data'})
+
+# External state (randomness, wall clock) that makes projections impure
+IMPURE_PATTERNS = ('rand::', 'random', 'std::time::Instant::now', 'SystemTime::now')
+EVENT_PATTERNS = ('START', 'DONE', 'THEORY', 'PRACTICE', 'GAME', 'TASK')
+
+# Every literal the checks look for. EXACT_TOKENS are case-sensitive;
+# FOLDED_TOKENS match in any case (the old `tok in content.lower()` checks).
+EXACT_TOKENS = (
+    'open(', 'write', 'append', 'append_to_log', 'master.log', '.db',
+    'requests.post', 'sqlite3', 'read_master_log', 'confidence', '.upper()',
+) + IMPURE_PATTERNS + EVENT_PATTERNS
+FOLDED_TOKENS = ('edit', 'update', 'correct', 'event', 'suggestion', 'log', 'uppercase')
+
+# Characters a token can start with. Testing the class first rejects most
+# offsets with one set lookup, before any alternative is tried.
+TOKEN_FIRST_CHARS = "".join(sorted(
+    {t[0] for t in EXACT_TOKENS} | {c for t in FOLDED_TOKENS for c in (t[0], t[0].upper())}
+))
+
+# One pass per file: the lookahead tries every offset, longest token first, so
+# a shorter token starting at the same offset is a substring of the hit
+# ('append' in 'append_to_log') and is recovered from it in _tokens.
+# Every token is ASCII, so the scan runs over the raw bytes and only the
+# hits are ever decoded.
+TOKEN_RE = re.compile(("(?=[%s])(?=(%s))" % (re.escape(TOKEN_FIRST_CHARS), "|".join(
+    re.escape(t) if t in EXACT_TOKENS else "(?i:%s)" % re.escape(t)
+    for t in sorted(EXACT_TOKENS + FOLDED_TOKENS, key=len, reverse=True)
+))).encode('ascii'))
+
+
+# Hits are mostly the tokens themselves, but folded tokens can appear in any
+# case mix, so the memo is bounded rather than left to grow with the sources
+TOKEN_HIT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=TOKEN_HIT_CACHE_SIZE)
+def tokens_in_hit(hit):
+    """Tokens contained in one TOKEN_RE hit; each distinct hit is decoded once per run"""
+    hit = hit.decode('ascii')
+    folded = hit.lower()
+    return frozenset(
+        [t for t in EXACT_TOKENS if t in hit] + [t for t in FOLDED_TOKENS if t in folded]
+    )
+
+
+def file_key(path):
+    """(mtime_ns, size) of a file as a JSON-friendly list, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
 class ArchitectureValidator:
     """Validates system against architecture invariants"""
     
-    def __init__(self):
+    # Check name (for --only/--skip) -> method, in report order
+    CHECKS = {
+        'append-only': 'validate_invariant_1_append_only_log',
+        'never-corrected': 'validate_invariant_2_events_never_corrected',
+        'inference-pure': 'validate_invariant_3_inference_pure',
+        'ui-stateless': 'validate_invariant_4_ui_doesnt_own_state',
+        'meaning-derived': 'validate_invariant_5_meaning_derived',
+        'llm-advisory': 'validate_llm_advisory',
+        'event-format': 'validate_event_format',
+        'projections-rebuildable': 'validate_projection_rebuildable',
+    }
+    
+    def __init__(self, cache_file=None):
         self.errors = []
         self.warnings = []
         self.passed = []
+        # (tokens, file key) by path, shared by every check. Only the token
+        # set is kept: a file's text is dropped as soon as it is scanned.
+        self._token_cache = {}
+        # Current file key by path, so replaying the four parser.py checks
+        # stats parser.py once rather than once per check
+        self._key_cache = {}
+        # Checks run on worker threads; each buffers its own output lines
+        self._local = threading.local()
+        self._cache_file = cache_file
+        self._results_cache = self._load_results_cache()
+    
+    def _load_results_cache(self):
+        """Cached check results, or {} if absent, unreadable or from another validate.py"""
+        if self._cache_file is None:
+            return {}
+        try:
+            cache = json.loads(self._cache_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+        # Results only hold for the check logic that produced them
+        if cache.get('validator') != file_key(__file__):
+            return {}
+        return cache.get('checks', {})
+    
+    def _save_results_cache(self):
+        if self._cache_file is None:
+            return
+        self._cache_file.write_text(json.dumps(
+            {'validator': file_key(__file__), 'checks': self._results_cache}
+        ))
+    
+    def _current_key(self, path):
+        if path not in self._key_cache:
+            self._key_cache[path] = file_key(path)
+        return self._key_cache[path]
+    
+    def _read(self, path):
+        """Return (bytes, file key) for the file, or (None, None) if it doesn't exist"""
+        # One open instead of a stat followed by an open; the key comes from
+        # the open file so it describes exactly the bytes read
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                return f.read(), [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            return None, None
+    
+    def _tokens(self, path):
+        """Return the frozenset of EXACT/FOLDED tokens in the file, or None if it doesn't exist"""
+        if path not in self._token_cache:
+            content, key = self._read(path)
+            found = None
+            if content is not None:
+                # Frozen: concurrently running checks share one set per file
+                found = frozenset().union(*map(tokens_in_hit, set(TOKEN_RE.findall(content))))
+            self._token_cache[path] = (found, key)
+        found, key = self._token_cache[path]
+        # Recorded on every call, so each check knows the files its result
+        # depends on even when another check scanned them first
+        self._local.reads[str(path)] = key
+        return found
+    
+    def _emit(self, line):
+        self._local.output.append(line)
+    
+    def _log(self, kind, line):
+        # kind names the result list: 'passed', 'warnings' or 'errors'
+        getattr(self, kind).append(line)
+        self._local.records.append([kind, line])
+        self._emit(line)
     
     def log_pass(self, msg):
-        self.passed.append(f"✅ {msg}")
-        print(f"✅ {msg}")
+        self._log('passed', f"✅ {msg}")
     
     def log_error(self, msg):
-        self.errors.append(f"❌ {msg}")
-        print(f"❌ {msg}")
+        self._log('errors', f"❌ {msg}")
     
     def log_warning(self, msg):
-        self.warnings.append(f"⚠️  {msg}")
-        print(f"⚠️  {msg}")
+        self._log('warnings', f"⚠️  {msg}")
+    
+    def _run_check(self, check):
+        """Run one check, or replay its cached result; return its output lines"""
+        name = check.__name__
+        cached = self._results_cache.get(name)
+        if cached is not None and all(
+            self._current_key(path) == key for path, key in cached['files'].items()
+        ):
+            for kind, line in cached['records']:
+                getattr(self, kind).append(line)
+            return cached['output']
+        
+        self._local.output = []
+        self._local.records = []
+        self._local.reads = {}
+        check()
+        self._results_cache[name] = {
+            'files': self._local.reads,
+            'records': self._local.records,
+            'output': self._local.output,
+        }
+        return self._local.output
     
     def validate_invariant_1_append_only_log(self):
         """Invariant: Event log is append-only"""
-        print("\n📋 Checking: Event log is append-only...")
+        self._emit("\n📋 Checking: Event log is append-only...")
         
         # Check that parser doesn't write to log
-        parser_file = Path("agent-service/src/parser.py")
-        if parser_file.exists():
-            content = parser_file.read_text()
-            if 'open(' in content and ('write' in content or 'append' in content):
-                if 'master.log' in content:
+        tokens = self._tokens(PARSER_PY)
+        if tokens is not None:
+            if 'open(' in tokens and ('write' in tokens or 'append' in tokens):
+                if 'master.log' in tokens:
                     self.log_error("Parser writes directly to master.log - violates invariant")
                 else:
                     self.log_pass("Parser doesn't write to master.log")
@@ -46,24 +224,22 @@ class ArchitectureValidator:
                 self.log_pass("Parser has no file write operations")
         
         # Check that only Rust API writes to log
-        rust_main = Path("Project-A-extension/src/main.rs")
-        if rust_main.exists():
-            content = rust_main.read_text()
-            if 'append_to_log' in content and 'master.log' in content:
+        tokens = self._tokens(RUST_MAIN)
+        if tokens is not None:
+            if 'append_to_log' in tokens and 'master.log' in tokens:
                 self.log_pass("Only Rust API has append_to_log for master.log")
             else:
                 self.log_warning("Cannot verify Rust API is only writer")
     
     def validate_invariant_2_events_never_corrected(self):
         """Invariant: Events are never corrected"""
-        print("\n📋 Checking: Events are never corrected...")
+        self._emit("\n📋 Checking: Events are never corrected...")
         
         # Check no edit/update operations on events
-        parser_file = Path("agent-service/src/parser.py")
-        if parser_file.exists():
-            content = parser_file.read_text()
-            if 'edit' in content.lower() or 'update' in content.lower() or 'correct' in content.lower():
-                if 'event' in content.lower():
+        tokens = self._tokens(PARSER_PY)
+        if tokens is not None:
+            if 'edit' in tokens or 'update' in tokens or 'correct' in tokens:
+                if 'event' in tokens:
                     self.log_warning("Found edit/update keywords - verify no event correction")
                 else:
                     self.log_pass("No event correction logic found")
@@ -72,15 +248,13 @@ class ArchitectureValidator:
     
     def validate_invariant_3_inference_pure(self):
         """Invariant: Inference is pure and replayable"""
-        print("\n📋 Checking: Inference is pure and replayable...")
+        self._emit("\n📋 Checking: Inference is pure and replayable...")
         
         # Check projections don't depend on external state
-        projections = Path("Project-A-extension/src/projections.rs")
-        if projections.exists():
-            content = projections.read_text()
+        tokens = self._tokens(PROJECTIONS_RS)
+        if tokens is not None:
             # Check for external dependencies (network, random, time-based)
-            impure_patterns = ['rand::', 'random', 'std::time::Instant::now', 'SystemTime::now']
-            found_impure = [p for p in impure_patterns if p in content]
+            found_impure = [p for p in IMPURE_PATTERNS if p in tokens]
             
             if found_impure:
                 self.log_error(f"Projections use impure operations: {found_impure}")
@@ -89,15 +263,14 @@ class ArchitectureValidator:
     
     def validate_invariant_4_ui_doesnt_own_state(self):
         """Invariant: UI does not own state"""
-        print("\n📋 Checking: UI does not own state...")
+        self._emit("\n📋 Checking: UI does not own state...")
         
-        bot_file = Path("telegram-bot/src/bot.py")
-        if bot_file.exists():
-            content = bot_file.read_text()
+        tokens = self._tokens(BOT_PY)
+        if tokens is not None:
             
             # Check for file writes (should only call APIs)
-            if 'open(' in content and 'write' in content:
-                if 'master.log' in content or '.db' in content:
+            if 'open(' in tokens and 'write' in tokens:
+                if 'master.log' in tokens or '.db' in tokens:
                     self.log_error("Bot writes directly to state files - violates invariant")
                 else:
                     self.log_warning("Bot has file writes - verify they're not state")
@@ -105,60 +278,56 @@ class ArchitectureValidator:
                 self.log_pass("Bot doesn't write to state files directly")
             
             # Check bot only emits events via API
-            if 'requests.post' in content:
+            if 'requests.post' in tokens:
                 self.log_pass("Bot uses API calls (not direct state access)")
     
     def validate_invariant_5_meaning_derived(self):
         """Invariant: Meaning is derived, not stored"""
-        print("\n📋 Checking: Meaning is derived, not stored...")
+        self._emit("\n📋 Checking: Meaning is derived, not stored...")
         
         # Check master.log is minimal
         # Check context is in SQLite (separate from log)
-        query_engine = Path("agent-service/src/query_engine.py")
-        if query_engine.exists():
-            content = query_engine.read_text()
-            if 'sqlite3' in content and 'master.log' in content:
+        tokens = self._tokens(QUERY_ENGINE_PY)
+        if tokens is not None:
+            if 'sqlite3' in tokens and 'master.log' in tokens:
                 self.log_pass("Query engine uses both SQLite (context) and master.log (truth)")
-            elif 'master.log' in content:
+            elif 'master.log' in tokens:
                 self.log_warning("Query engine only uses master.log - context storage missing?")
     
     def validate_llm_advisory(self):
         """Additional: LLM is advisory, not authoritative"""
-        print("\n📋 Checking: LLM is advisory (never writes directly)...")
+        self._emit("\n📋 Checking: LLM is advisory (never writes directly)...")
         
-        parser_file = Path("agent-service/src/parser.py")
-        if parser_file.exists():
-            content = parser_file.read_text()
+        tokens = self._tokens(PARSER_PY)
+        if tokens is not None:
             
             # Check parser returns suggestions
-            if 'confidence' in content or 'suggestion' in content.lower():
+            if 'confidence' in tokens or 'suggestion' in tokens:
                 self.log_pass("Parser includes confidence/suggestion mechanism")
             else:
                 self.log_warning("Parser may not clearly indicate advisory nature")
             
             # Check no direct writes
-            if 'append' in content and 'log' in content.lower():
+            if 'append' in tokens and 'log' in tokens:
                 self.log_error("Parser may write directly to log")
             else:
                 self.log_pass("Parser doesn't write to log directly")
     
     def validate_event_format(self):
         """Validate: Events follow correct format"""
-        print("\n📋 Checking: Event format...")
+        self._emit("\n📋 Checking: Event format...")
         
-        parser_file = Path("agent-service/src/parser.py")
-        if parser_file.exists():
-            content = parser_file.read_text()
+        tokens = self._tokens(PARSER_PY)
+        if tokens is not None:
             
             # Check for uppercase formatting
-            if '.upper()' in content or 'uppercase' in content.lower():
+            if '.upper()' in tokens or 'uppercase' in tokens:
                 self.log_pass("Events formatted in uppercase")
             else:
                 self.log_warning("Cannot verify uppercase formatting")
             
             # Check format pattern
-            valid_patterns = ['START', 'DONE', 'THEORY', 'PRACTICE', 'GAME', 'TASK']
-            found_patterns = [p for p in valid_patterns if p in content]
+            found_patterns = [p for p in EVENT_PATTERNS if p in tokens]
             if len(found_patterns) >= 4:
                 self.log_pass(f"Found event type patterns: {found_patterns}")
             else:
@@ -166,50 +335,75 @@ class ArchitectureValidator:
     
     def validate_projection_rebuildable(self):
         """Validate: Projections can be deleted and rebuilt"""
-        print("\n📋 Checking: Projections are disposable...")
+        self._emit("\n📋 Checking: Projections are disposable...")
         
         # Check SQLite is not treated as source of truth
-        query_engine = Path("agent-service/src/query_engine.py")
-        if query_engine.exists():
-            content = query_engine.read_text()
+        tokens = self._tokens(QUERY_ENGINE_PY)
+        if tokens is not None:
             
             # Projections should derive from master.log, not SQLite
-            if 'read_master_log' in content:
+            if 'read_master_log' in tokens:
                 self.log_pass("Projections derive from master.log (can be rebuilt)")
             else:
                 self.log_warning("Projections may depend on SQLite - verify rebuildability")
     
-    def run_all_validations(self):
-        """Run all validation checks"""
-        print("=" * 60)
-        print("🔍 Architecture Validation")
-        print("=" * 60)
-        
-        self.validate_invariant_1_append_only_log()
-        self.validate_invariant_2_events_never_corrected()
-        self.validate_invariant_3_inference_pure()
-        self.validate_invariant_4_ui_doesnt_own_state()
-        self.validate_invariant_5_meaning_derived()
-        self.validate_llm_advisory()
-        self.validate_event_format()
-        self.validate_projection_rebuildable()
-        
-        print("\n" + "=" * 60)
-        print("📊 Validation Summary")
-        print("=" * 60)
-        print(f"✅ Passed: {len(self.passed)}")
-        print(f"⚠️  Warnings: {len(self.warnings)}")
-        print(f"❌ Errors: {len(self.errors)}")
+    def run_all_validations(self, only=None, skip=()):
+        """Run the validation checks; all of them unless narrowed by only/skip names"""
+        checks = [
+            getattr(self, method) for name, method in self.CHECKS.items()
+            if (not only or name in only) and name not in skip
+        ]
+        lines = ["=" * 60, "🔍 Architecture Validation", "=" * 60]
+        # The checks are independent and I/O-bound, so their reads overlap;
+        # output is still collected in check order.
+        with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as executor:
+            for output in executor.map(self._run_check, checks):
+                lines.extend(output)
+        self._save_results_cache()
         
         if self.errors:
-            print("\n❌ VALIDATION FAILED - Architecture invariants violated")
-            return 1
+            verdict, result = "❌ VALIDATION FAILED - Architecture invariants violated", 1
         elif self.warnings:
-            print("\n⚠️  VALIDATION PASSED WITH WARNINGS")
-            return 0
+            verdict, result = "⚠️  VALIDATION PASSED WITH WARNINGS", 0
         else:
-            print("\n✅ ALL VALIDATIONS PASSED")
-            return 0
+            verdict, result = "✅ ALL VALIDATIONS PASSED", 0
+        lines.append(
+            f"\n{'=' * 60}\n"
+            f"📊 Validation Summary\n"
+            f"{'=' * 60}\n"
+            f"✅ Passed: {len(self.passed)}\n"
+            f"⚠️  Warnings: {len(self.warnings)}\n"
+            f"❌ Errors: {len(self.errors)}\n"
+            f"\n{verdict}"
+        )
+        
+        # One write for the whole report
+        sys.stdout.write("\n".join(lines) + "\n")
+        return result
+
+
+def tree_digest(root, argv):
+    """BLAKE2b of the command plus (relpath, mtime_ns, size) of every file under root"""
+    digest = hashlib.blake2b(repr(argv).encode())
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Pruned and sorted in place, so the walk order (and digest) is stable
+        dirnames[:] = sorted(
+            d for d in dirnames if d not in TREE_SKIP_DIRS and not d.startswith('.')
+        )
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            stat = os.lstat(path)
+            digest.update(
+                f"{os.path.relpath(path, root)}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode()
+            )
+    return digest.hexdigest()
+
+
+def _stream_output(name, process):
+    """Echo a child's output line by line as it arrives; return its exit code"""
+    for line in process.stdout:
+        print(f"[{name}] {line}", end="")
+    return process.wait()
 
 
 def run_unit_tests():
@@ -218,56 +412,100 @@ def run_unit_tests():
     print("🧪 Running Unit Tests")
     print("=" * 60)
     
-    # Python tests
-    print("\n📦 Python Tests (Agent Service)...")
-    result = subprocess.run(
-        ['python', '-m', 'pytest', 'agent-service/tests/', '-v'],
-        capture_output=True,
-        text=True,
-        cwd='/home/demi/.projects/basic-agent'
-    )
+    # (name, label, argv, cwd, source tree); the suites are independent, so
+    # both start at once and the run takes as long as the slower one
+    suites = [
+        ('Python', 'Agent Service',
+         # -x stops at the first failure; --ff runs last run's failures first
+         ['python', '-m', 'pytest', '-x', '--ff', 'agent-service/tests/', '-v'],
+         PROJECT_DIR,
+         os.path.join(PROJECT_DIR, 'agent-service')),
+        ('Rust', 'Project-A-extension',
+         # cargo test already stops at the first failing test binary
+         ['cargo', 'test'],
+         os.path.join(PROJECT_DIR, 'Project-A-extension'),
+         os.path.join(PROJECT_DIR, 'Project-A-extension')),
+    ]
     
-    print(result.stdout)
-    if result.returncode != 0:
-        print(result.stderr)
-        print("❌ Python tests failed")
-        return 1
-    else:
-        print("✅ Python tests passed")
-    
-    # Rust tests
-    print("\n📦 Rust Tests (Project-A-extension)...")
-    result = subprocess.run(
-        ['cargo', 'test'],
-        capture_output=True,
-        text=True,
-        cwd='/home/demi/.projects/basic-agent/Project-A-extension'
-    )
+    # A suite whose sources are unchanged since its last green run is skipped
+    try:
+        with open(TEST_CACHE_FILE) as f:
+            green = json.load(f)
+    except (FileNotFoundError, ValueError):
+        green = {}
+    digests = {name: tree_digest(tree, argv) for name, _, argv, _, tree in suites}
+    for name, _, _, _, _ in suites:
+        if green.get(name) == digests[name]:
+            print(f"\n✅ {name} tests passed (cached - sources unchanged since last green run)")
+    suites = [suite for suite in suites if green.get(suite[0]) != digests[suite[0]]]
+    if not suites:
+        return 0
     
-    print(result.stdout)
-    if result.returncode != 0:
-        print(result.stderr)
-        print("❌ Rust tests failed")
-        return 1
-    else:
-        print("✅ Rust tests passed")
+    print("\n📦 " + " + ".join(f"{name} Tests ({label})" for name, label, _, _, _ in suites) + "...")
+    processes = [
+        subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            cwd=cwd
+        )
+        for _, _, argv, cwd, _ in suites
+    ]
+    # Output streams live instead of being held until exit; lines are tagged
+    # with their suite because the two interleave
+    with ThreadPoolExecutor(max_workers=len(processes)) as executor:
+        returncodes = list(executor.map(
+            _stream_output, [name for name, _, _, _, _ in suites], processes
+        ))
+    
+    print()
+    result = 0
+    for (name, _, _, _, _), returncode in zip(suites, returncodes):
+        if returncode != 0:
+            print(f"❌ {name} tests failed")
+            green.pop(name, None)
+            result = 1
+        else:
+            print(f"✅ {name} tests passed")
+            green[name] = digests[name]
     
-    return 0
+    with open(TEST_CACHE_FILE, 'w') as f:
+        json.dump(green, f)
+    return result
 
 
-def main():
+def main(argv=None):
     """Main validation entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    check_names = list(ArchitectureValidator.CHECKS)
+    parser.add_argument('--only', action='append', choices=check_names, metavar='CHECK',
+                        help=f"run only this check (repeatable): {', '.join(check_names)}")
+    parser.add_argument('--skip', action='append', default=[], choices=check_names,
+                        metavar='CHECK', help="skip this check (repeatable)")
+    parser.add_argument('--skip-tests', action='store_true',
+                        help="don't run the Python and Rust unit tests")
+    args = parser.parse_args(argv)
+    
     print("🔧 Event-Driven Agent System - Validation Suite")
     
     # Change to project directory
-    os.chdir('/home/demi/.projects/basic-agent')
+    if not os.path.isdir(PROJECT_DIR):
+        print(f"❌ Project directory not found: {PROJECT_DIR}")
+        return 1
+    os.chdir(PROJECT_DIR)
+    
+    # Without any sources every check and test run would be wasted work
+    if not any(source.exists() for source in SOURCE_FILES):
+        print(f"❌ No sources to validate under {PROJECT_DIR}")
+        return 1
     
     # Run architecture validation
-    validator = ArchitectureValidator()
-    arch_result = validator.run_all_validations()
+    validator = ArchitectureValidator(cache_file=Path(RESULTS_CACHE_FILE))
+    arch_result = validator.run_all_validations(only=args.only, skip=args.skip)
     
     # Run unit tests
-    test_result = run_unit_tests()
+    test_result = 0 if args.skip_tests else run_unit_tests()
     
     # Final summary
     print("\n" + "=" * 60)